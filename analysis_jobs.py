@@ -0,0 +1,129 @@
+import os
+import queue
+import threading
+import time
+import uuid
+
+
+class QueueFull(Exception):
+    pass
+
+
+class AnalysisJobQueue:
+    """Bounded in-process queue of analysis jobs served by a small pool of worker threads
+
+    Results live in this process only, so clients must poll the same server
+    process that accepted the job (true for a single gunicorn worker).
+    """
+
+    def __init__(self, workers=2, max_pending=32, result_ttl=600):
+        self.workers = workers
+        self.result_ttl = result_ttl
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._jobs = {}
+        self._changed = threading.Condition()
+        self._started_pid = None
+
+    @classmethod
+    def from_env(cls):
+        """Configure from ANALYSIS_WORKERS, ANALYSIS_QUEUE_SIZE and ANALYSIS_RESULT_TTL"""
+        return cls(
+            workers=int(os.environ.get('ANALYSIS_WORKERS', 2)),
+            max_pending=int(os.environ.get('ANALYSIS_QUEUE_SIZE', 32)),
+            result_ttl=float(os.environ.get('ANALYSIS_RESULT_TTL', 600))
+        )
+
+    def _ensure_workers(self):
+        # Threads don't survive a fork, so start them lazily in the serving process
+        if self._started_pid == os.getpid():
+            return
+        with self._changed:
+            if self._started_pid == os.getpid():
+                return
+            for _ in range(self.workers):
+                threading.Thread(target=self._work, daemon=True).start()
+            self._started_pid = os.getpid()
+
+    def submit(self, func, *args):
+        """Queue func(*args), which returns (payload, status_code); returns the job id"""
+        self._ensure_workers()
+        self._expire()
+
+        job_id = uuid.uuid4().hex
+        with self._changed:
+            self._jobs[job_id] = {
+                'status': 'queued',
+                'created': time.time(),
+                'finished': None,
+                'payload': None,
+                'status_code': None
+            }
+        try:
+            self._queue.put_nowait((job_id, func, args))
+        except queue.Full:
+            with self._changed:
+                del self._jobs[job_id]
+            raise QueueFull()
+        return job_id
+
+    def _work(self):
+        while True:
+            job_id, func, args = self._queue.get()
+            self._update(job_id, status='running')
+            try:
+                payload, status_code = func(*args)
+            except Exception as e:
+                print(f"Error: {str(e)}")
+                payload, status_code = {'error': f'An error occurred: {str(e)}'}, 500
+            self._update(
+                job_id,
+                status='done' if status_code < 400 else 'error',
+                payload=payload,
+                status_code=status_code,
+                finished=time.time()
+            )
+            self._queue.task_done()
+
+    def _update(self, job_id, **fields):
+        with self._changed:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.update(fields)
+            self._changed.notify_all()
+
+    def _expire(self):
+        """Forget finished jobs older than result_ttl"""
+        cutoff = time.time() - self.result_ttl
+        with self._changed:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job['finished'] is not None and job['finished'] < cutoff
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+
+    def get(self, job_id):
+        """Snapshot of a job's state, or None if unknown or expired"""
+        self._expire()
+        with self._changed:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def wait(self, job_id, last_status, timeout):
+        """Block until the job's status differs from last_status or timeout elapses"""
+        deadline = time.monotonic() + timeout
+        with self._changed:
+            while True:
+                job = self._jobs.get(job_id)
+                if job is None or job['status'] != last_status:
+                    return dict(job) if job is not None else None
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return dict(job)
+                self._changed.wait(remaining)
+
+    def pending(self):
+        return self._queue.qsize()
+
+
+analysis_jobs = AnalysisJobQueue.from_env()
@@ -1,21 +1,68 @@
-from flask import Flask, render_template, request, jsonify
-import os
-from werkzeug.utils import secure_filename
+from flask import Flask, Response, render_template, request, jsonify, stream_with_context
 import json
+import os
 
-from resume_parser import parse_resume
-from job_matcher import analyze_resume_for_job, load_job_descriptions
+import metrics
+from analysis_jobs import QueueFull, analysis_jobs
+
+from resume_cache import content_digest, iter_parse_cached, parse_many_cached, parse_resume_cached, resume_cache
+from resume_store import get_store
+from result_store import result_store
+from job_matcher import MatchResult, compare_resumes, match_resume, rank_jobs
+from job_catalog import get_catalog
+from resume_parser import get_skill_matcher, load_docx
+from similarity import ENGINES, get_engine
+from tfidf_model import get_model
 
 app = Flask(__name__)
 
-UPLOAD_FOLDER = 'uploads'
 ALLOWED_EXTENSIONS = {'pdf', 'docx'}
 MAX_FILE_SIZE = 16 * 1024 * 1024
+MAX_BATCH_FILES = int(os.environ.get('MAX_BATCH_FILES', 50))
 
-app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = MAX_FILE_SIZE
+# Background jobs live in the accepting process, so the web page only polls
+# for them when one process serves every request; gunicorn.conf.py turns
+# this off for multi-worker deployments
+app.config['ASYNC_UPLOADS'] = True
+
+
+def collect_gauges():
+    cache_stats = resume_cache.stats()
+    return [
+        ('resume_cache_entries', 'gauge', {
+            (('tier', 'memory'),): cache_stats['memory_entries'],
+            (('tier', 'disk'),): cache_stats.get('disk_entries', 0)
+        }),
+        ('analysis_queue_pending', 'gauge', {(): analysis_jobs.pending()}),
+        ('result_store_entries', 'gauge', {(): result_store.stats()['entries']})
+    ]
+
+
+metrics.registry.add_collector(collect_gauges)
+
+
+@app.before_request
+def start_timing():
+    metrics.start_request()
+
+
+@app.after_request
+def finish_timing(response):
+    return metrics.finish_request(request.endpoint, response)
+
+
+def warm_up():
+    """Build the catalog, skill matcher, TF-IDF model and similarity engine before serving requests
 
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+    Under gunicorn's preload_app this runs once in the master, and forked
+    workers share the results copy-on-write instead of rebuilding them.
+    """
+    get_catalog()
+    get_skill_matcher()
+    get_model()
+    get_engine()
+    load_docx()
 
 
 def allowed_file(filename):
@@ -24,8 +71,112 @@ def allowed_file(filename):
 
 @app.route('/')
 def index():
-    job_titles = list(load_job_descriptions().keys())
-    return render_template('index.html', job_titles=job_titles)
+    job_titles = list(get_catalog().titles)
+    return render_template('index.html', job_titles=job_titles, async_uploads=app.config['ASYNC_UPLOADS'])
+
+
+def requested_engine():
+    """Similarity engine named by the request's 'engine' field; None selects SIMILARITY_ENGINE"""
+    engine = request.form.get('engine', request.args.get('engine', '')).strip().lower()
+    return engine or None
+
+
+def unknown_engine_error(engine):
+    """Error response for an engine name that isn't registered, else None"""
+    if engine is not None and engine not in ENGINES:
+        return jsonify({'error': f'Unknown similarity engine "{engine}". Choose from: {", ".join(ENGINES)}'}), 400
+    return None
+
+
+def analyze_upload(data, job_title, engine=None):
+    """Parse and analyze uploaded resume bytes; returns (MatchResult or error dict, status_code)"""
+    engine = get_engine(engine)
+    digest = content_digest(data)
+
+    # A file already scored against this version of the job is one indexed read
+    result = result_store.get(digest, job_title, engine)
+    if result is not None:
+        return result, 200
+
+    # Parse straight from memory; uploads never touch the filesystem
+    resume_data = parse_resume_cached(data)
+
+    if 'error' in resume_data:
+        return {'error': resume_data['error']}, 400
+
+    result = match_resume(resume_data, job_title, engine)
+
+    if result is None:
+        return {'error': f'Job title "{job_title}" not found in database.'}, 400
+
+    result_store.put(digest, result, engine)
+    return result, 200
+
+
+def serialize(payload):
+    """Expand a compact result into its JSON shape at the response boundary"""
+    return payload.to_dict() if isinstance(payload, MatchResult) else payload
+
+
+def wants_async():
+    value = request.form.get('async', request.args.get('async', ''))
+    return value.lower() in ('1', 'true', 'yes')
+
+
+def stream_uploads(uploads, job_title, engine=None):
+    """Yield one NDJSON line per uploaded (filename, data) as soon as its analysis finishes"""
+    def line(record):
+        return json.dumps(record) + '\n'
+
+    accepted = []
+    for index, (filename, data) in enumerate(uploads):
+        if allowed_file(filename):
+            accepted.append((index, filename, data))
+        else:
+            yield line({
+                'index': index, 'filename': filename, 'status': 400,
+                'error': 'Invalid file type. Please upload PDF or DOCX'
+            })
+
+    errors = len(uploads) - len(accepted)
+    engine = get_engine(engine)
+    digests = [content_digest(data) for _, _, data in accepted]
+
+    # Files already scored against this job go out first, straight from the result store
+    stored = result_store.get_many(digests, job_title, engine)
+    pending = []
+    for (index, filename, data), digest in zip(accepted, digests):
+        if digest in stored:
+            yield line({'index': index, 'filename': filename, 'status': 200, 'result': stored[digest].to_dict()})
+        else:
+            pending.append((index, filename, data, digest))
+
+    computed = []
+    for position, resume_data in iter_parse_cached([data for _, _, data, _ in pending]):
+        index, filename, _, digest = pending[position]
+        record = {'index': index, 'filename': filename}
+        try:
+            if 'error' in resume_data:
+                record.update(status=400, error=resume_data['error'])
+            else:
+                result = match_resume(resume_data, job_title, engine)
+                if result is None:
+                    record.update(status=400, error=f'Job title "{job_title}" not found in database.')
+                else:
+                    computed.append((digest, result))
+                    record.update(status=200, result=result.to_dict())
+        except Exception as e:
+            print(f"Error: {str(e)}")
+            metrics.inc('resume_errors_total', stage='request')
+            record.update(status=500, error=f'An error occurred: {str(e)}')
+        if record['status'] != 200:
+            errors += 1
+        yield line(record)
+
+    # One transaction for the whole batch
+    result_store.put_many(computed, engine)
+
+    yield line({'done': True, 'total': len(uploads), 'errors': errors})
 
 
 @app.route('/upload', methods=['POST'])
@@ -34,8 +185,29 @@ def upload_resume():
         if 'resume' not in request.files:
             return jsonify({'error': 'No file uploaded'}), 400
 
-        file = request.files['resume']
+        files = request.files.getlist('resume')
         job_title = request.form.get('job_title')
+        engine = requested_engine()
+
+        error = unknown_engine_error(engine)
+        if error:
+            return error
+
+        if len(files) > 1:
+            # Several files: stream each file's analysis back as its own NDJSON line
+            if len(files) > MAX_BATCH_FILES:
+                return jsonify({'error': f'Too many files. Maximum is {MAX_BATCH_FILES}'}), 400
+            if not job_title:
+                return jsonify({'error': 'Please select a job title'}), 400
+            # Read every file now; the uploads are closed once this view returns
+            uploads = [(file.filename, file.read()) for file in files]
+            return Response(
+                stream_with_context(stream_uploads(uploads, job_title, engine)),
+                mimetype='application/x-ndjson',
+                headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+            )
+
+        file = files[0]
 
         if file.filename == '':
             return jsonify({'error': 'No file selected'}), 400
@@ -46,34 +218,257 @@ def upload_resume():
         if not job_title:
             return jsonify({'error': 'Please select a job title'}), 400
 
-        filename = secure_filename(file.filename)
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
+        if wants_async():
+            try:
+                job_id = analysis_jobs.submit(analyze_upload, file.read(), job_title, engine)
+            except QueueFull:
+                response = jsonify({'error': 'Server is busy. Please try again shortly.'})
+                response.headers['Retry-After'] = '5'
+                return response, 429
+
+            return jsonify({
+                'job_id': job_id,
+                'status': 'queued',
+                'result_url': f'/api/result/{job_id}',
+                'events_url': f'/api/result/{job_id}/events'
+            }), 202
+
+        payload, status_code = analyze_upload(file.read(), job_title, engine)
+        return jsonify(serialize(payload)), status_code
+
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        metrics.inc('resume_errors_total', stage='request')
+        return jsonify({'error': f'An error occurred: {str(e)}'}), 500
+
+
+@app.route('/api/rank', methods=['POST'])
+def rank_resume():
+    try:
+        if 'resume' not in request.files:
+            return jsonify({'error': 'No file uploaded'}), 400
+
+        file = request.files['resume']
 
-        resume_data = parse_resume(filepath)
+        if file.filename == '':
+            return jsonify({'error': 'No file selected'}), 400
+
+        if not allowed_file(file.filename):
+            return jsonify({'error': 'Invalid file type. Please upload PDF or DOCX'}), 400
+
+        try:
+            top_k = int(request.form.get('top_k', 5))
+        except ValueError:
+            return jsonify({'error': 'top_k must be an integer'}), 400
+
+        engine = requested_engine()
+        error = unknown_engine_error(engine)
+        if error:
+            return error
+
+        resume_data = parse_resume_cached(file.read())
 
         if 'error' in resume_data:
-            os.remove(filepath)
             return jsonify({'error': resume_data['error']}), 400
 
-        analysis_result = analyze_resume_for_job(resume_data, job_title)
+        return jsonify({
+            'rankings': rank_jobs(resume_data, top_k, engine),
+            'email': resume_data.get('email'),
+            'phone': resume_data.get('phone')
+        }), 200
+
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        metrics.inc('resume_errors_total', stage='request')
+        return jsonify({'error': f'An error occurred: {str(e)}'}), 500
+
+
+@app.route('/api/compare', methods=['POST'])
+def compare_resumes_for_job():
+    try:
+        files = [file for file in request.files.getlist('resumes') if file.filename]
+        job_title = request.form.get('job_title')
+        engine = requested_engine()
+
+        error = unknown_engine_error(engine)
+        if error:
+            return error
+
+        if not files:
+            return jsonify({'error': 'No files uploaded'}), 400
+
+        if len(files) > MAX_BATCH_FILES:
+            return jsonify({'error': f'Too many files. Maximum is {MAX_BATCH_FILES}'}), 400
+
+        if not job_title:
+            return jsonify({'error': 'Please select a job title'}), 400
+
+        if job_title not in get_catalog():
+            return jsonify({'error': f'Job title "{job_title}" not found in database.'}), 400
+
+        errors = []
+        accepted = []
+        for file in files:
+            if allowed_file(file.filename):
+                accepted.append((file.filename, file.read()))
+            else:
+                errors.append({'filename': file.filename, 'error': 'Invalid file type. Please upload PDF or DOCX'})
+
+        # Parsed together so the batch shares one process pool and one model
+        parsed = []
+        for (filename, _), resume_data in zip(accepted, parse_many_cached([data for _, data in accepted])):
+            if 'error' in resume_data:
+                errors.append({'filename': filename, 'error': resume_data['error']})
+            else:
+                parsed.append((filename, resume_data))
+
+        rankings = compare_resumes([resume_data for _, resume_data in parsed], job_title, engine)
+        if rankings is None:
+            return jsonify({'error': f'Job title "{job_title}" not found in database.'}), 400
+        for row in rankings:
+            row['filename'] = parsed[row.pop('index')][0]
+
+        return jsonify({
+            'job_title': job_title,
+            'compared': len(rankings),
+            'rankings': rankings,
+            'errors': errors
+        }), 200
+
+    except Exception as e:
+        print(f"Error: {str(e)}")
+        metrics.inc('resume_errors_total', stage='request')
+        return jsonify({'error': f'An error occurred: {str(e)}'}), 500
+
+
+def job_status(job_id, job):
+    body = {'job_id': job_id, 'status': job['status']}
+    if job['status'] == 'done':
+        body['result'] = serialize(job['payload'])
+    elif job['status'] == 'error':
+        body['error'] = job['payload'].get('error')
+    return body
+
+
+@app.route('/api/result/<job_id>')
+def get_result(job_id):
+    job = analysis_jobs.get(job_id)
+
+    if job is None:
+        return jsonify({'error': 'Job not found or expired'}), 404
+
+    status_code = job['status_code'] if job['status'] == 'error' else 200
+    return jsonify(job_status(job_id, job)), status_code
+
+
+@app.route('/api/result/<job_id>/events')
+def stream_result(job_id):
+    job = analysis_jobs.get(job_id)
+
+    if job is None:
+        return jsonify({'error': 'Job not found or expired'}), 404
+
+    def events():
+        current = job
+        yield f"event: {current['status']}\ndata: {json.dumps(job_status(job_id, current))}\n\n"
+        while current['status'] not in ('done', 'error'):
+            last_status = current['status']
+            current = analysis_jobs.wait(job_id, last_status, timeout=15)
+            if current is None:
+                return
+            if current['status'] == last_status:
+                # Keep-alive comment for proxies while the job is still running
+                yield ': keep-alive\n\n'
+            else:
+                yield f"event: {current['status']}\ndata: {json.dumps(job_status(job_id, current))}\n\n"
+
+    return Response(
+        stream_with_context(events()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+@app.route('/api/resumes', methods=['POST'])
+def store_resume():
+    try:
+        if 'resume' not in request.files:
+            return jsonify({'error': 'No file uploaded'}), 400
+
+        file = request.files['resume']
+
+        if file.filename == '':
+            return jsonify({'error': 'No file selected'}), 400
+
+        if not allowed_file(file.filename):
+            return jsonify({'error': 'Invalid file type. Please upload PDF or DOCX'}), 400
 
-        if 'error' in analysis_result:
-            os.remove(filepath)
-            return jsonify({'error': analysis_result['error']}), 400
+        data = file.read()
+        resume_data = parse_resume_cached(data)
 
-        os.remove(filepath)
+        if 'error' in resume_data:
+            return jsonify({'error': resume_data['error']}), 400
 
-        analysis_result['email'] = resume_data.get('email')
-        analysis_result['phone'] = resume_data.get('phone')
+        resume_id = get_store().add(content_digest(data), file.filename, resume_data)
 
-        return jsonify(analysis_result), 200
+        return jsonify({'resume_id': resume_id, 'skills': sorted(resume_data['skills'])}), 201
 
     except Exception as e:
         print(f"Error: {str(e)}")
+        metrics.inc('resume_errors_total', stage='request')
         return jsonify({'error': f'An error occurred: {str(e)}'}), 500
 
 
+@app.route('/api/resumes/search')
+def search_resumes():
+    job_title = request.args.get('job_title')
+
+    if not job_title:
+        return jsonify({'error': 'Please select a job title'}), 400
+
+    try:
+        top_k = int(request.args.get('top_k', 20))
+        min_skills = int(request.args.get('min_skills', 1))
+    except ValueError:
+        return jsonify({'error': 'top_k and min_skills must be integers'}), 400
+
+    must_have = [skill for skill in request.args.get('must_have', '').split(',') if skill.strip()]
+    results = get_store().search(job_title, top_k, min_skills, must_have)
+
+    if results is None:
+        return jsonify({'error': 'Job not found'}), 404
+
+    return jsonify({'job_title': job_title, 'results': results})
+
+
+@app.route('/api/results')
+def get_stored_results():
+    resume_hash = request.args.get('resume_hash')
+    job_title = request.args.get('job_title')
+    engine = requested_engine()
+
+    error = unknown_engine_error(engine)
+    if error:
+        return error
+
+    if resume_hash:
+        return jsonify({'resume_hash': resume_hash, 'results': result_store.for_resume(resume_hash, engine)})
+
+    if not job_title:
+        return jsonify({'error': 'Please give a resume_hash or a job_title'}), 400
+
+    try:
+        top_k = int(request.args.get('top_k', 20))
+    except ValueError:
+        return jsonify({'error': 'top_k must be an integer'}), 400
+
+    results = result_store.for_job(job_title, top_k, engine)
+    if results is None:
+        return jsonify({'error': 'Job not found'}), 404
+
+    return jsonify({'job_title': job_title, 'results': results})
+
+
 @app.route('/results')
 def results():
     return render_template('results.html')
@@ -81,18 +476,27 @@ def results():
 
 @app.route('/api/jobs')
 def get_jobs():
-    job_descriptions = load_job_descriptions()
-    return jsonify({'jobs': list(job_descriptions.keys())})
+    return app.response_class(get_catalog().jobs_json, mimetype='application/json')
 
 
-@app.route('/api/job/<job_title>')
+@app.route('/api/job/<path:job_title>')
 def get_job_details(job_title):
-    job_descriptions = load_job_descriptions()
+    job_json = get_catalog().job_json.get(job_title)
 
-    if job_title not in job_descriptions:
+    if job_json is None:
         return jsonify({'error': 'Job not found'}), 404
 
-    return jsonify(job_descriptions[job_title])
+    return app.response_class(job_json, mimetype='application/json')
+
+
+@app.route('/api/cache/stats')
+def get_cache_stats():
+    return jsonify(resume_cache.stats())
+
+
+@app.route('/metrics')
+def get_metrics():
+    return app.response_class(metrics.registry.render(), mimetype='text/plain; version=0.0.4')
 
 
 @app.errorhandler(413)
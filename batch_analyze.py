@@ -0,0 +1,235 @@
+"""Analyze a folder (or manifest) of resumes in parallel and stream results to JSONL or CSV.
+
+Examples:
+    python batch_analyze.py resumes/ --job-title "Data Scientist" -o results.jsonl
+    python batch_analyze.py manifest.txt --rank --top-k 3 -o rankings.csv --resume
+"""
+import argparse
+import csv
+import json
+import os
+import signal
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from job_catalog import get_catalog
+from job_matcher import match_resume, rank_jobs
+from resume_cache import parse_resume_cached
+from tfidf_model import get_model
+
+RESUME_EXTENSIONS = ('.pdf', '.docx')
+
+OUTPUT_FIELDS = [
+    'file', 'job_title', 'rank', 'overall_match', 'semantic_match', 'skill_match',
+    'matched_skills_count', 'total_required_skills', 'matched_skills', 'missing_skills',
+    'email', 'phone', 'error'
+]
+
+
+class FileTimeout(BaseException):
+    """Raised by SIGALRM; not an Exception so the extractors' error handling can't swallow it"""
+
+
+def find_resumes(source):
+    """List resume files from a directory tree or a manifest with one path per line"""
+    if os.path.isdir(source):
+        paths = []
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith(RESUME_EXTENSIONS):
+                    paths.append(os.path.join(root, name))
+        return paths
+
+    base_dir = os.path.dirname(os.path.abspath(source))
+    paths = []
+    with open(source, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                paths.append(line if os.path.isabs(line) else os.path.join(base_dir, line))
+    return paths
+
+
+def _init_worker():
+    """Load the catalog and fitted vectorizer once per worker process"""
+    get_model()
+
+
+def _raise_timeout(signum, frame):
+    raise FileTimeout()
+
+
+def analyze_file(path, job_titles, rank, top_k, timeout):
+    """Parse one resume and score it; always returns a list of output records"""
+    use_alarm = timeout and hasattr(signal, 'setitimer')
+
+    try:
+        if use_alarm:
+            signal.signal(signal.SIGALRM, _raise_timeout)
+            signal.setitimer(signal.ITIMER_REAL, timeout)
+
+        resume_data = parse_resume_cached(path)
+        if 'error' in resume_data:
+            return [{'file': path, 'error': resume_data['error']}]
+
+        contact = {'email': resume_data.get('email'), 'phone': resume_data.get('phone')}
+
+        if rank:
+            return [
+                {'file': path, 'rank': position, **result, **contact}
+                for position, result in enumerate(rank_jobs(resume_data, top_k), start=1)
+            ]
+
+        records = []
+        for job_title in job_titles:
+            result = match_resume(resume_data, job_title)
+            if result is None:
+                records.append({
+                    'file': path, 'job_title': job_title,
+                    'error': f'Job title "{job_title}" not found in database.'
+                })
+                continue
+            fields = result.to_dict(detail=False)
+            fields = {field: fields[field] for field in OUTPUT_FIELDS if field in fields}
+            records.append({'file': path, **fields, **contact})
+        return records
+
+    except FileTimeout:
+        return [{'file': path, 'error': f'Timed out after {timeout}s'}]
+    except Exception as e:
+        return [{'file': path, 'error': f'An error occurred: {e}'}]
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+class ResultWriter:
+    """Append records to a JSONL or CSV file, flushing after every resume"""
+
+    def __init__(self, path, fmt, append):
+        self.fmt = fmt
+        exists = append and os.path.exists(path) and os.path.getsize(path) > 0
+        self.file = open(path, 'a' if append else 'w', newline='')
+        if fmt == 'csv':
+            self.csv_writer = csv.DictWriter(self.file, fieldnames=OUTPUT_FIELDS, extrasaction='ignore')
+            if not exists:
+                self.csv_writer.writeheader()
+
+    def write(self, records):
+        if self.fmt == 'csv':
+            for record in records:
+                row = dict(record)
+                for field in ('matched_skills', 'missing_skills'):
+                    if isinstance(row.get(field), list):
+                        row[field] = ';'.join(row[field])
+                self.csv_writer.writerow(row)
+        else:
+            self.file.write(''.join(json.dumps(record) + '\n' for record in records))
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+def completed_files(path, fmt):
+    """Files that already have records in an existing output file"""
+    done = set()
+    if not os.path.exists(path):
+        return done
+
+    with open(path, 'r', newline='') as f:
+        if fmt == 'csv':
+            for row in csv.DictReader(f):
+                if row.get('file'):
+                    done.add(row['file'])
+        else:
+            for line in f:
+                try:
+                    done.add(json.loads(line)['file'])
+                except (ValueError, KeyError, TypeError):
+                    # Partial line from an interrupted run
+                    continue
+    return done
+
+
+def run(paths, job_titles, rank, top_k, output, fmt, workers, timeout, resume):
+    """Process every path and return a summary dict"""
+    skipped = 0
+    if resume:
+        done = completed_files(output, fmt)
+        remaining = [path for path in paths if path not in done]
+        skipped = len(paths) - len(remaining)
+        paths = remaining
+
+    writer = ResultWriter(output, fmt, append=resume)
+    processed = errors = 0
+    start = time.perf_counter()
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            futures = [
+                executor.submit(analyze_file, path, job_titles, rank, top_k, timeout)
+                for path in paths
+            ]
+            for future in as_completed(futures):
+                records = future.result()
+                writer.write(records)
+                processed += 1
+                if any('error' in record for record in records):
+                    errors += 1
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - start
+    return {
+        'processed': processed,
+        'errors': errors,
+        'skipped': skipped,
+        'elapsed': elapsed,
+        'files_per_second': processed / elapsed if elapsed > 0 else 0.0
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Batch-analyze resumes against job roles.')
+    parser.add_argument('source', help='Directory of PDF/DOCX resumes or a manifest file with one path per line')
+    parser.add_argument('-j', '--job-title', action='append', default=[],
+                        help='Job title to score against (repeatable)')
+    parser.add_argument('--rank', action='store_true', help='Rank every job in the catalog instead')
+    parser.add_argument('--top-k', type=int, default=5, help='Jobs to keep per resume with --rank')
+    parser.add_argument('-o', '--output', required=True, help='Output file (.jsonl or .csv)')
+    parser.add_argument('--format', choices=['jsonl', 'csv'], help='Output format (default: from extension)')
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 1, help='Worker processes')
+    parser.add_argument('--timeout', type=float, default=60.0, help='Per-file timeout in seconds (0 to disable)')
+    parser.add_argument('--resume', action='store_true', help='Skip files already present in the output')
+    args = parser.parse_args(argv)
+
+    if not args.rank and not args.job_title:
+        parser.error('give at least one --job-title or use --rank')
+
+    catalog = get_catalog()
+    unknown = [title for title in args.job_title if title not in catalog]
+    if unknown:
+        parser.error(f'unknown job title(s): {", ".join(unknown)}')
+
+    fmt = args.format or ('csv' if args.output.lower().endswith('.csv') else 'jsonl')
+    paths = find_resumes(args.source)
+
+    summary = run(
+        paths, args.job_title, args.rank, args.top_k, args.output, fmt,
+        max(1, args.workers), args.timeout, args.resume
+    )
+
+    print(
+        f"Processed {summary['processed']} resumes ({summary['errors']} with errors, "
+        f"{summary['skipped']} skipped) in {summary['elapsed']:.1f}s "
+        f"- {summary['files_per_second']:.1f} files/sec",
+        file=sys.stderr
+    )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
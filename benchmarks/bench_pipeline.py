@@ -0,0 +1,165 @@
+"""Time each stage of the parse and match pipeline over a synthetic corpus.
+
+Run from the repository root:
+    python -m benchmarks.bench_pipeline -o bench.json
+    python -m benchmarks.bench_pipeline -o new.json --baseline bench.json --threshold 0.1
+"""
+import argparse
+import io
+import json
+import platform
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.corpus import DENSITIES, SIZES, generate_corpus, write_corpus
+from job_matcher import analyze_resume_for_job, categorize_skills
+from resume_parser import clean_text, extract_skills, extract_text_from_docx, find_contact, iter_pdf_pages, parse_resume
+from tfidf_model import get_model
+
+STAGES = ['extraction', 'cleaning', 'contact', 'skills', 'similarity', 'categorization', 'analyze', 'parse_resume']
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def _extract(item):
+    if item['format'] == 'pdf':
+        return ''.join(iter_pdf_pages(item['data']))
+    return extract_text_from_docx(io.BytesIO(item['data']))
+
+
+def time_document(item, model):
+    """Per-stage timings (seconds) for one document"""
+    timings = {}
+    raw_text, timings['extraction'] = _timed(_extract, item)
+    cleaned_text, timings['cleaning'] = _timed(clean_text, raw_text)
+    _, timings['contact'] = _timed(find_contact, raw_text)
+    skills, timings['skills'] = _timed(extract_skills, cleaned_text)
+    _, timings['similarity'] = _timed(model.similarity, cleaned_text, item['job_title'])
+    _, timings['categorization'] = _timed(categorize_skills, skills)
+    resume_data = {'cleaned_text': cleaned_text, 'skills': skills}
+    _, timings['analyze'] = _timed(analyze_resume_for_job, resume_data, item['job_title'])
+    _, timings['parse_resume'] = _timed(parse_resume, item['data'])
+    return timings
+
+
+def summarize(samples):
+    """Latency percentiles (ms) and throughput for one stage"""
+    values = np.array(samples)
+    total = values.sum()
+    return {
+        'count': len(values),
+        'mean_ms': round(float(values.mean()) * 1000, 4),
+        'p50_ms': round(float(np.percentile(values, 50)) * 1000, 4),
+        'p95_ms': round(float(np.percentile(values, 95)) * 1000, 4),
+        'p99_ms': round(float(np.percentile(values, 99)) * 1000, 4),
+        'docs_per_sec': round(len(values) / total, 2) if total > 0 else None
+    }
+
+
+def run(corpus, repeat):
+    model = get_model()
+
+    # Warm-up pass so lazy initialisation doesn't land in the measurements
+    for item in corpus[:2]:
+        time_document(item, model)
+
+    samples = {stage: [] for stage in STAGES}
+    groups = {}
+    for _ in range(repeat):
+        for item in corpus:
+            timings = time_document(item, model)
+            for stage, seconds in timings.items():
+                samples[stage].append(seconds)
+            key = f"{item['format']}/{item['size']}/{item['density']}"
+            groups.setdefault(key, {stage: [] for stage in STAGES})
+            for stage, seconds in timings.items():
+                groups[key][stage].append(seconds)
+
+    return {
+        'stages': {stage: summarize(values) for stage, values in samples.items()},
+        'groups': {
+            key: {stage: summarize(values) for stage, values in stages.items()}
+            for key, stages in sorted(groups.items())
+        }
+    }
+
+
+def compare(results, baseline, threshold):
+    """List stages whose p50 or p95 got slower than the baseline by more than threshold"""
+    regressions = []
+    for stage, stats in results['stages'].items():
+        previous = baseline.get('stages', {}).get(stage)
+        if not previous:
+            continue
+        for metric in ('p50_ms', 'p95_ms'):
+            if previous[metric] and stats[metric] > previous[metric] * (1 + threshold):
+                regressions.append({
+                    'stage': stage,
+                    'metric': metric,
+                    'baseline': previous[metric],
+                    'current': stats[metric],
+                    'change': round(stats[metric] / previous[metric] - 1, 4)
+                })
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the resume parse/match hot paths.')
+    parser.add_argument('--count', type=int, default=4, help='Documents per size/density/format combination')
+    parser.add_argument('--sizes', nargs='+', choices=list(SIZES), default=list(SIZES))
+    parser.add_argument('--densities', nargs='+', choices=list(DENSITIES), default=list(DENSITIES))
+    parser.add_argument('--formats', nargs='+', choices=['pdf', 'docx'], default=['pdf', 'docx'])
+    parser.add_argument('--repeat', type=int, default=3, help='Passes over the corpus')
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('-o', '--output', default='bench_results.json', help='Where to write the JSON results')
+    parser.add_argument('--corpus-dir', help='Also write the generated resumes to this directory')
+    parser.add_argument('--baseline', help='Previous results JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=0.10, help='Allowed slowdown before flagging (0.10 = 10%%)')
+    args = parser.parse_args(argv)
+
+    corpus = generate_corpus(args.count, args.sizes, args.densities, args.formats, args.seed)
+    if args.corpus_dir:
+        write_corpus(corpus, args.corpus_dir)
+    results = run(corpus, args.repeat)
+    results['meta'] = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'documents': len(corpus),
+        'repeat': args.repeat,
+        'seed': args.seed,
+        'sizes': args.sizes,
+        'densities': args.densities,
+        'formats': args.formats
+    }
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        results['regressions'] = compare(results, baseline, args.threshold)
+        if results['regressions']:
+            status = 1
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+
+    print(f"{'stage':<16}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'docs/s':>10}")
+    for stage, stats in results['stages'].items():
+        print(f"{stage:<16}{stats['p50_ms']:>10.3f}{stats['p95_ms']:>10.3f}"
+              f"{stats['p99_ms']:>10.3f}{stats['docs_per_sec'] or 0:>10.1f}")
+    for regression in results.get('regressions', []):
+        print(f"REGRESSION {regression['stage']} {regression['metric']}: "
+              f"{regression['baseline']} -> {regression['current']} ms ({regression['change']:+.0%})",
+              file=sys.stderr)
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,169 @@
+"""Compare the similarity engines on latency, memory and ranking quality.
+
+Run from the repository root:
+    python -m benchmarks.bench_similarity -o similarity.json
+    python -m benchmarks.bench_similarity --count 20 --engines tfidf bm25
+
+Every synthetic resume is written for one catalog job, which serves as its
+label. For each engine the benchmark reports build time and memory, per-resume
+and batch scoring latency, how often the label is ranked first (semantic score
+alone and overall match) with its mean reciprocal rank, and how closely the
+engine's job rankings agree with TF-IDF's.
+"""
+import argparse
+import json
+import pickle
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+from scipy.stats import spearmanr
+
+from benchmarks.corpus import DENSITIES, SIZES, generate_corpus
+from job_catalog import get_catalog
+from job_matcher import rank_jobs
+from resume_parser import parse_resume
+from similarity import ENGINES
+from tfidf_model import TfidfModel
+
+
+def build(name):
+    """Build an engine from scratch; returns (engine, seconds, peak traced bytes)"""
+    catalog = get_catalog()
+    tracemalloc.start()
+    start = time.perf_counter()
+    # TF-IDF's build includes fitting the model it wraps
+    engine = ENGINES[name](TfidfModel.fit(catalog) if name == 'tfidf' else catalog)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return engine, seconds, peak
+
+
+def footprint(engine):
+    """Pickled size in bytes of what the engine keeps between requests"""
+    return len(pickle.dumps((engine.vectorizer, engine.job_matrix)))
+
+
+def ranking_quality(rankings, labels):
+    """Top-1 accuracy and mean reciprocal rank of the labelled job"""
+    top1, reciprocal = [], []
+    for ranked, label in zip(rankings, labels):
+        position = ranked.index(label) + 1 if label in ranked else None
+        top1.append(position == 1)
+        reciprocal.append(1 / position if position else 0.0)
+    return {
+        'top1_accuracy': round(float(np.mean(top1)), 4),
+        'mrr': round(float(np.mean(reciprocal)), 4)
+    }
+
+
+def _order(titles, scores):
+    # Highest score first; ties keep catalog order, like rank_jobs
+    return [titles[i] for i in np.lexsort((np.arange(len(scores)), -scores))]
+
+
+def run(resumes, labels, engine_names, repeat):
+    titles = get_catalog().titles
+    texts = [resume_data['cleaned_text'] for resume_data in resumes]
+    results = {}
+    semantic_scores = {}
+
+    for name in engine_names:
+        engine, build_s, build_peak = build(name)
+
+        latencies = []
+        for _ in range(repeat):
+            for text in texts:
+                start = time.perf_counter()
+                engine.similarities(text)
+                latencies.append(time.perf_counter() - start)
+
+        batch = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            scores = engine.scores(texts)
+            batch.append(time.perf_counter() - start)
+        semantic_scores[name] = scores
+
+        semantic_rankings = [_order(titles, row) for row in scores]
+        overall_rankings = [
+            [row['job_title'] for row in rank_jobs(resume_data, len(titles), name)] for resume_data in resumes
+        ]
+        latencies = np.array(latencies)
+        results[name] = {
+            'build_ms': round(build_s * 1000, 3),
+            'build_peak_kb': round(build_peak / 1024, 1),
+            'resident_kb': round(footprint(engine) / 1024, 1),
+            'features': int(engine.job_matrix.shape[1]),
+            'single_p50_ms': round(float(np.percentile(latencies, 50)) * 1000, 4),
+            'single_p95_ms': round(float(np.percentile(latencies, 95)) * 1000, 4),
+            'batch_ms': round(float(np.median(batch)) * 1000, 3),
+            'batch_docs_per_sec': round(len(texts) / float(np.median(batch)), 1),
+            'semantic': ranking_quality(semantic_rankings, labels),
+            'overall': ranking_quality(overall_rankings, labels),
+            '_overall_top1': [ranked[0] for ranked in overall_rankings]
+        }
+
+    # Agreement with TF-IDF, the engine the other scores were tuned against
+    if 'tfidf' in results:
+        for name, stats in results.items():
+            correlations = [
+                spearmanr(a, b)[0] for a, b in zip(semantic_scores[name], semantic_scores['tfidf'])
+            ]
+            correlations = [c for c in correlations if not np.isnan(c)]
+            stats['vs_tfidf'] = {
+                'spearman_mean': round(float(np.mean(correlations)), 4) if correlations else None,
+                'overall_top1_agreement': round(float(np.mean([
+                    a == b for a, b in zip(stats['_overall_top1'], results['tfidf']['_overall_top1'])
+                ])), 4)
+            }
+    for stats in results.values():
+        del stats['_overall_top1']
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the similarity engines.')
+    parser.add_argument('--count', type=int, default=10, help='Documents per size/density combination')
+    parser.add_argument('--repeat', type=int, default=3, help='Passes over the corpus per engine')
+    parser.add_argument('--engines', nargs='+', choices=list(ENGINES), default=list(ENGINES))
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('-o', '--output', default='similarity_results.json', help='Where to write the JSON results')
+    args = parser.parse_args(argv)
+
+    corpus = generate_corpus(args.count, sizes=SIZES, densities=DENSITIES, formats=['pdf'], seed=args.seed)
+    resumes, labels = [], []
+    for item in corpus:
+        resume_data = parse_resume(item['data'])
+        if 'error' not in resume_data:
+            resumes.append(resume_data)
+            labels.append(item['job_title'])
+
+    results = {
+        'engines': run(resumes, labels, args.engines, args.repeat),
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'documents': len(resumes),
+            'jobs': len(get_catalog()),
+            'repeat': args.repeat
+        }
+    }
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+
+    for name, stats in results['engines'].items():
+        agreement = stats.get('vs_tfidf', {})
+        print(f"{name:<8} build={stats['build_ms']}ms resident={stats['resident_kb']}kB "
+              f"p50={stats['single_p50_ms']}ms batch={stats['batch_docs_per_sec']}/s "
+              f"top1 semantic={stats['semantic']['top1_accuracy']} overall={stats['overall']['top1_accuracy']} "
+              f"mrr={stats['overall']['mrr']} spearman_vs_tfidf={agreement.get('spearman_mean')}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,223 @@
+"""Measure cold-start time and per-worker memory, with and without the warm-up phase.
+
+Run from the repository root:
+    python -m benchmarks.bench_startup -o startup.json
+    python -m benchmarks.bench_startup --workers 4 --skip-gunicorn
+
+Import and first-request timings run in fresh interpreters. The gunicorn part
+starts the app twice, once with gunicorn.conf.py (preload + warm-up) and once
+with an empty config, and reads each worker's RSS/PSS from /proc (Linux only).
+"""
+import argparse
+import json
+import os
+import platform
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+import uuid
+
+from benchmarks.corpus import generate_corpus
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in a fresh interpreter; prints one JSON line of timings
+PROBE = '''
+import io, json, sys, time
+start = time.perf_counter()
+import app
+timings = {'import_s': time.perf_counter() - start}
+if WARM:
+    start = time.perf_counter()
+    app.warm_up()
+    timings['warm_up_s'] = time.perf_counter() - start
+timings['docx_imported'] = 'docx' in sys.modules
+client = app.app.test_client()
+with open(RESUME, 'rb') as f:
+    data = f.read()
+job_title = next(iter(app.get_catalog().titles))
+for key in ('first_request_s', 'second_request_s'):
+    start = time.perf_counter()
+    response = client.post('/upload', data={'resume': (io.BytesIO(data), 'resume.pdf'), 'job_title': job_title},
+                           content_type='multipart/form-data')
+    timings[key] = time.perf_counter() - start
+    assert response.status_code == 200, response.get_data(as_text=True)
+print(json.dumps(timings))
+'''
+
+
+def probe(resume_path, warm):
+    """Time import, warm-up and the first two /upload requests in a new process"""
+    code = f'WARM = {warm!r}\nRESUME = {resume_path!r}\n' + PROBE
+    env = dict(os.environ, METRICS_ENABLED='0', RESUME_CACHE_SIZE='0', RESUME_CACHE_DB='', RESULT_STORE_DB='')
+    output = subprocess.run(
+        [sys.executable, '-c', code], cwd=ROOT, env=env, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def summarize_probes(samples):
+    keys = [key for key in samples[0] if key != 'docx_imported']
+    summary = {f'{key}_median': round(statistics.median(s[key] for s in samples), 4) for key in keys}
+    summary['docx_imported'] = samples[0]['docx_imported']
+    return summary
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _multipart(fields, file_field, filename, data):
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode())
+    parts.append(
+        f'--{boundary}\r\nContent-Disposition: form-data; name="{file_field}"; filename="{filename}"\r\n'
+        f'Content-Type: application/octet-stream\r\n\r\n'.encode() + data + b'\r\n'
+    )
+    parts.append(f'--{boundary}--\r\n'.encode())
+    return b''.join(parts), f'multipart/form-data; boundary={boundary}'
+
+
+def _children(pid):
+    children = []
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                fields = f.read().rsplit(')', 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[1]) == pid:
+            children.append(int(entry))
+    return sorted(children)
+
+
+def memory_kb(pid):
+    """RSS, PSS and shared memory of a process in kB, from smaps_rollup"""
+    values = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            name, _, rest = line.partition(':')
+            if name in ('Rss', 'Pss', 'Shared_Clean', 'Shared_Dirty'):
+                values[name] = int(rest.split()[0])
+    return {
+        'rss_kb': values.get('Rss', 0),
+        'pss_kb': values.get('Pss', 0),
+        'shared_kb': values.get('Shared_Clean', 0) + values.get('Shared_Dirty', 0)
+    }
+
+
+def run_gunicorn(config_path, workers, resume_data, requests_per_worker, timeout=120):
+    """Start gunicorn, time until it answers, exercise it, then sample worker memory"""
+    port = _free_port()
+    base_url = f'http://127.0.0.1:{port}'
+    env = dict(os.environ, METRICS_ENABLED='0', RESUME_CACHE_SIZE='0', RESUME_CACHE_DB='', RESULT_STORE_DB='')
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '--config', config_path, '--workers', str(workers),
+         '--bind', f'127.0.0.1:{port}', 'app:app'],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError('gunicorn exited during startup')
+            if time.perf_counter() - start > timeout:
+                raise RuntimeError('gunicorn did not start in time')
+            try:
+                with urllib.request.urlopen(f'{base_url}/api/jobs', timeout=2) as response:
+                    job_title = json.load(response)['jobs'][0]
+                break
+            except OSError:
+                time.sleep(0.05)
+        ready_s = time.perf_counter() - start
+
+        body, content_type = _multipart({'job_title': job_title}, 'resume', 'resume.pdf', resume_data)
+        latencies = []
+        for _ in range(workers * requests_per_worker):
+            request = urllib.request.Request(
+                f'{base_url}/upload', data=body, headers={'Content-Type': content_type}
+            )
+            request_start = time.perf_counter()
+            with urllib.request.urlopen(request, timeout=60) as response:
+                response.read()
+            latencies.append(time.perf_counter() - request_start)
+
+        worker_pids = _children(process.pid)
+        workers_memory = [memory_kb(pid) for pid in worker_pids]
+        return {
+            'ready_s': round(ready_s, 4),
+            'first_request_s': round(latencies[0], 4),
+            'request_median_s': round(statistics.median(latencies), 4),
+            'master': memory_kb(process.pid),
+            'workers': workers_memory,
+            'worker_rss_kb_mean': round(statistics.mean(m['rss_kb'] for m in workers_memory)),
+            'worker_pss_kb_mean': round(statistics.mean(m['pss_kb'] for m in workers_memory)),
+            'total_pss_kb': memory_kb(process.pid)['pss_kb'] + sum(m['pss_kb'] for m in workers_memory)
+        }
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark cold start and per-worker memory.')
+    parser.add_argument('--repeat', type=int, default=3, help='Fresh interpreters per import probe')
+    parser.add_argument('--workers', type=int, default=2, help='Gunicorn workers to start')
+    parser.add_argument('--requests', type=int, default=2, help='Uploads per worker before sampling memory')
+    parser.add_argument('--skip-gunicorn', action='store_true')
+    parser.add_argument('-o', '--output', default='startup_results.json', help='Where to write the JSON results')
+    args = parser.parse_args(argv)
+
+    resume = generate_corpus(1, sizes=['small'], densities=['high'], formats=['pdf'])[0]
+    with tempfile.TemporaryDirectory() as tmp:
+        resume_path = os.path.join(tmp, 'resume.pdf')
+        with open(resume_path, 'wb') as f:
+            f.write(resume['data'])
+
+        results = {
+            'import': {
+                'lazy': summarize_probes([probe(resume_path, False) for _ in range(args.repeat)]),
+                'warm_up': summarize_probes([probe(resume_path, True) for _ in range(args.repeat)])
+            }
+        }
+
+        if not args.skip_gunicorn:
+            empty_config = os.path.join(tmp, 'empty.conf.py')
+            open(empty_config, 'w').close()
+            results['gunicorn'] = {
+                'preload': run_gunicorn(os.path.join(ROOT, 'gunicorn.conf.py'), args.workers,
+                                        resume['data'], args.requests),
+                'no_preload': run_gunicorn(empty_config, args.workers, resume['data'], args.requests)
+            }
+
+    results['meta'] = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'workers': args.workers
+    }
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+
+    for mode, stats in results['import'].items():
+        print(f"{mode:<10} " + '  '.join(f'{key}={value}' for key, value in stats.items()))
+    for mode, stats in results.get('gunicorn', {}).items():
+        print(f"{mode:<10} ready={stats['ready_s']}s first={stats['first_request_s']}s "
+              f"worker_rss={stats['worker_rss_kb_mean']}kB worker_pss={stats['worker_pss_kb_mean']}kB "
+              f"total_pss={stats['total_pss_kb']}kB")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
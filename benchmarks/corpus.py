@@ -0,0 +1,147 @@
+"""Reproducible synthetic resume corpus (PDF and DOCX) generated entirely offline."""
+import io
+import os
+import random
+
+from job_catalog import get_catalog
+from resume_parser import SKILL_KEYWORDS
+
+SIZES = {'small': 1, 'medium': 3, 'large': 10}
+DENSITIES = {'low': 0.02, 'high': 0.15}
+
+LINES_PER_PAGE = 50
+WORDS_PER_LINE = 12
+
+FIRST_NAMES = ['Alex', 'Sam', 'Jordan', 'Taylor', 'Morgan', 'Casey', 'Riley', 'Jamie', 'Avery', 'Quinn']
+LAST_NAMES = ['Smith', 'Garcia', 'Chen', 'Patel', 'Kim', 'Okafor', 'Novak', 'Silva', 'Müller', 'Haddad']
+FILLER = (
+    'led designed built delivered improved maintained collaborated with cross-functional teams '
+    'to ship reliable scalable features for customers across multiple products and regions while '
+    'mentoring engineers reviewing code writing documentation and reducing operational costs by '
+    'automating manual processes and measuring impact with clear metrics over several quarters'
+).split()
+SECTIONS = ['Summary', 'Experience', 'Projects', 'Education', 'Skills', 'Certifications']
+
+
+def resume_lines(rng, job_title, pages, density):
+    """Lines of a synthetic resume slanted towards one job's required skills"""
+    catalog = get_catalog()
+    job_skills = list(catalog.required_skills.get(job_title, ()))
+    other_skills = sorted(SKILL_KEYWORDS)
+
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    lines = [
+        name,
+        f"{name.split()[0].lower()}.{rng.randint(1, 999)}@example.com | "
+        f"+1 ({rng.randint(200, 999)}) {rng.randint(200, 999)}-{rng.randint(1000, 9999)}",
+        f"Target role: {job_title}",
+    ]
+
+    total_lines = pages * LINES_PER_PAGE
+    while len(lines) < total_lines:
+        if len(lines) % 15 == 3:
+            lines.append(rng.choice(SECTIONS))
+            continue
+        words = []
+        for _ in range(WORDS_PER_LINE):
+            if rng.random() < density:
+                # Mostly the target job's skills, sometimes unrelated ones
+                pool = job_skills if job_skills and rng.random() < 0.7 else other_skills
+                words.append(rng.choice(pool))
+            else:
+                words.append(rng.choice(FILLER))
+        lines.append(' '.join(words))
+    return lines
+
+
+def _pdf_escape(text):
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def make_pdf(lines, lines_per_page=LINES_PER_PAGE):
+    """Write a minimal multi-page PDF with one Helvetica text line per row"""
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    objects = {
+        1: '<< /Type /Catalog /Pages 2 0 R >>',
+        3: '<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>',
+    }
+    kids = []
+    number = 4
+    for page in pages:
+        content = 'BT /F1 10 Tf 50 760 Td 14 TL ' + ' '.join(f"({_pdf_escape(line)}) '" for line in page) + ' ET'
+        content = content.encode('cp1252', errors='replace')
+        objects[number] = (f'<< /Length {len(content)} >>\nstream\n'.encode() + content + b'\nendstream')
+        objects[number + 1] = (
+            f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {number} 0 R '
+            f'/Resources << /Font << /F1 3 0 R >> >> >>'
+        )
+        kids.append(f'{number + 1} 0 R')
+        number += 2
+    objects[2] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = {}
+    for key in sorted(objects):
+        body = objects[key]
+        if isinstance(body, str):
+            body = body.encode('latin-1')
+        offsets[key] = len(out)
+        out += f'{key} 0 obj\n'.encode() + body + b'\nendobj\n'
+
+    xref = len(out)
+    size = max(objects) + 1
+    out += f'xref\n0 {size}\n0000000000 65535 f \n'.encode()
+    out += b''.join(f'{offsets[key]:010d} 00000 n \n'.encode() for key in range(1, size))
+    out += f'trailer\n<< /Size {size} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n'.encode()
+    return bytes(out)
+
+
+def make_docx(lines):
+    """Write a DOCX with one paragraph per line"""
+    from docx import Document
+
+    document = Document()
+    for line in lines:
+        document.add_paragraph(line)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def generate_corpus(count=4, sizes=None, densities=None, formats=('pdf', 'docx'), seed=1234):
+    """Generate resumes for every size/density/format combination
+
+    Returns a list of dicts with the file bytes and the labels used to
+    generate it (format, size, density, job_title).
+    """
+    rng = random.Random(seed)
+    titles = get_catalog().titles
+    corpus = []
+    for size in sizes or SIZES:
+        for density in densities or DENSITIES:
+            for file_format in formats:
+                for index in range(count):
+                    job_title = titles[rng.randrange(len(titles))] if titles else ''
+                    lines = resume_lines(rng, job_title, SIZES[size], DENSITIES[density])
+                    data = make_pdf(lines) if file_format == 'pdf' else make_docx(lines)
+                    corpus.append({
+                        'name': f'{size}-{density}-{index:03d}.{file_format}',
+                        'format': file_format,
+                        'size': size,
+                        'density': density,
+                        'job_title': job_title,
+                        'data': data
+                    })
+    return corpus
+
+
+def write_corpus(corpus, directory):
+    """Write generated resumes to a directory and return their paths"""
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for item in corpus:
+        path = os.path.join(directory, item['name'])
+        with open(path, 'wb') as f:
+            f.write(item['data'])
+        paths.append(path)
+    return paths
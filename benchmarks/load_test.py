@@ -0,0 +1,463 @@
+"""Replay a mix of HTTP traffic against a locally started app and report how it holds up.
+
+Run from the repository root:
+    python -m benchmarks.load_test --workers 1 2 4 --concurrency 4 8 --duration 20 -o load.json
+    python -m benchmarks.load_test --server flask --mix upload=1,jobs=4,job=4
+    python -m benchmarks.load_test --threads 4 --streamlit -o new.json --baseline load.json
+
+Every worker/thread model gets a fresh server: gunicorn with gunicorn.conf.py
+(sync workers, or gthread with --threads > 1) or the Flask development
+server. Each requested concurrency level then runs for --duration seconds
+with that many client threads. Uploads use generated resumes and random
+catalog jobs. The report has throughput, latency percentiles and error rates
+per endpoint, plus each worker's RSS/PSS sampled over time (Linux only). With
+--streamlit, the Streamlit app is started alongside and its health endpoint
+is polled during the runs.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+import numpy as np
+
+from benchmarks.bench_startup import ROOT, _children, _free_port, _multipart, memory_kb
+from benchmarks.corpus import generate_corpus
+
+OPERATIONS = ('upload', 'jobs', 'job')
+
+DEFAULT_MIX = 'upload=2,jobs=4,job=4'
+
+
+def parse_mix(text):
+    """'upload=2,jobs=4' -> {'upload': 2.0, 'jobs': 4.0}"""
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f'unknown operation "{name}"; choose from {", ".join(OPERATIONS)}')
+        try:
+            mix[name] = float(weight or 1)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f'bad weight for {name}: {weight}')
+    if not any(mix.values()):
+        raise argparse.ArgumentTypeError('the mix needs at least one positive weight')
+    return mix
+
+
+def _wait_ready(process, url, timeout):
+    start = time.perf_counter()
+    while True:
+        if process.poll() is not None:
+            raise RuntimeError(f'server exited during startup ({url})')
+        if time.perf_counter() - start > timeout:
+            raise RuntimeError(f'server did not answer {url} in time')
+        try:
+            with urllib.request.urlopen(url, timeout=2) as response:
+                response.read()
+            return time.perf_counter() - start
+        except OSError:
+            time.sleep(0.05)
+
+
+def start_app(server, workers, threads, env, timeout=120):
+    """Start the Flask app under gunicorn or the development server; returns (process, base_url, ready_s)"""
+    port = _free_port()
+    if server == 'gunicorn':
+        command = [sys.executable, '-m', 'gunicorn', '--config', os.path.join(ROOT, 'gunicorn.conf.py'),
+                   '--workers', str(workers), '--bind', f'127.0.0.1:{port}', '--timeout', '120']
+        if threads > 1:
+            command += ['--worker-class', 'gthread', '--threads', str(threads)]
+        command.append('app:app')
+    else:
+        command = [sys.executable, '-m', 'flask', '--app', 'app', 'run', '--host', '127.0.0.1',
+                   '--port', str(port), '--no-reload', '--no-debugger',
+                   '--with-threads' if threads > 1 else '--without-threads']
+    process = subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base_url = f'http://127.0.0.1:{port}'
+    try:
+        ready_s = _wait_ready(process, f'{base_url}/api/jobs', timeout)
+    except Exception:
+        stop(process)
+        raise
+    return process, base_url, ready_s
+
+
+def start_streamlit(env, timeout=120):
+    """Start streamlit_app.py headless; returns (process, health_url)"""
+    port = _free_port()
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'streamlit', 'run', 'streamlit_app.py', '--server.headless', 'true',
+         '--server.port', str(port), '--server.address', '127.0.0.1', '--browser.gatherUsageStats', 'false'],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    health_url = f'http://127.0.0.1:{port}/_stcore/health'
+    try:
+        _wait_ready(process, health_url, timeout)
+    except Exception:
+        stop(process)
+        raise
+    return process, health_url
+
+
+def stop(process):
+    process.terminate()
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+def _server_pids(process, server):
+    # gunicorn's master only forks; the development server handles requests itself
+    if server == 'gunicorn':
+        return _children(process.pid)
+    return [process.pid]
+
+
+class MemorySampler(threading.Thread):
+    """Samples RSS/PSS of the serving processes every interval seconds"""
+
+    def __init__(self, process, server, interval):
+        super().__init__(daemon=True)
+        self.process = process
+        self.server = server
+        self.interval = interval
+        self.samples = []
+        # Not _stop: Thread.join() calls a private method of that name on Python 3.11
+        self._stop_event = threading.Event()
+        self._start = time.perf_counter()
+
+    def sample(self):
+        workers = {}
+        for pid in _server_pids(self.process, self.server):
+            try:
+                workers[str(pid)] = memory_kb(pid)
+            except OSError:
+                continue
+        self.samples.append({'t': round(time.perf_counter() - self._start, 3), 'workers': workers})
+
+    def run(self):
+        while not self._stop_event.is_set():
+            self.sample()
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+        self.sample()
+
+
+class HealthPoller(threading.Thread):
+    """Polls a health URL every interval seconds, recording latency and failures"""
+
+    def __init__(self, url, interval):
+        super().__init__(daemon=True)
+        self.url = url
+        self.interval = interval
+        self.latencies = []
+        self.failures = 0
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(self.url, timeout=10) as response:
+                    response.read()
+                self.latencies.append(time.perf_counter() - start)
+            except OSError:
+                self.failures += 1
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+        checks = len(self.latencies) + self.failures
+        return {
+            'checks': checks,
+            'error_rate': round(self.failures / checks, 4) if checks else None,
+            **_percentiles(self.latencies)
+        }
+
+
+class Workload:
+    """Builds the requests of the traffic mix from generated resumes and the served catalog"""
+
+    def __init__(self, base_url, resumes, job_titles, mix):
+        self.base_url = base_url
+        self.resumes = resumes
+        self.job_titles = job_titles
+        self.operations = [name for name in OPERATIONS if mix.get(name)]
+        self.weights = [mix[name] for name in self.operations]
+
+    def request(self, rng):
+        """A random (operation, urllib Request) drawn from the mix"""
+        operation = rng.choices(self.operations, self.weights)[0]
+        if operation == 'jobs':
+            return operation, urllib.request.Request(f'{self.base_url}/api/jobs')
+        job_title = rng.choice(self.job_titles)
+        if operation == 'job':
+            return operation, urllib.request.Request(
+                f'{self.base_url}/api/job/{urllib.parse.quote(job_title, safe="")}'
+            )
+        resume = rng.choice(self.resumes)
+        body, content_type = _multipart({'job_title': job_title}, 'resume', resume['name'], resume['data'])
+        return operation, urllib.request.Request(
+            f'{self.base_url}/upload', data=body, headers={'Content-Type': content_type}
+        )
+
+
+def _client(workload, deadline, seed, records):
+    rng = random.Random(seed)
+    while time.perf_counter() < deadline:
+        operation, request = workload.request(rng)
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request, timeout=120) as response:
+                response.read()
+                status = response.status
+        except urllib.error.HTTPError as e:
+            status = e.code
+        except OSError:
+            status = None
+        records.append((operation, start, time.perf_counter() - start, status))
+
+
+def _percentiles(latencies):
+    if not latencies:
+        return {'p50_ms': None, 'p90_ms': None, 'p95_ms': None, 'p99_ms': None}
+    values = np.array(latencies) * 1000
+    return {f'p{q}_ms': round(float(np.percentile(values, q)), 3) for q in (50, 90, 95, 99)}
+
+
+def summarize(records, elapsed):
+    """Throughput, error rate and latency percentiles, overall and per operation"""
+    def stats(rows):
+        errors = sum(1 for row in rows if row[3] is None or row[3] >= 400)
+        return {
+            'requests': len(rows),
+            'throughput_rps': round(len(rows) / elapsed, 2) if elapsed else None,
+            'error_rate': round(errors / len(rows), 4) if rows else None,
+            **_percentiles([row[2] for row in rows])
+        }
+
+    summary = stats(records)
+    summary['operations'] = {
+        operation: stats([row for row in records if row[0] == operation])
+        for operation in OPERATIONS if any(row[0] == operation for row in records)
+    }
+    return summary
+
+
+def summarize_memory(samples):
+    """Peak and final RSS/PSS per worker, and the per-sample totals over time"""
+    workers = {}
+    for sample in samples:
+        for pid, memory in sample['workers'].items():
+            stats = workers.setdefault(pid, {'rss_kb_peak': 0, 'pss_kb_peak': 0})
+            stats['rss_kb_peak'] = max(stats['rss_kb_peak'], memory['rss_kb'])
+            stats['pss_kb_peak'] = max(stats['pss_kb_peak'], memory['pss_kb'])
+            stats['rss_kb_final'] = memory['rss_kb']
+            stats['pss_kb_final'] = memory['pss_kb']
+    return {
+        'workers': workers,
+        'timeline': [
+            {
+                't': sample['t'],
+                'total_pss_kb': sum(m['pss_kb'] for m in sample['workers'].values()),
+                'max_worker_rss_kb': max((m['rss_kb'] for m in sample['workers'].values()), default=0)
+            }
+            for sample in samples
+        ],
+        'samples': samples
+    }
+
+
+def run_level(workload, process, server, concurrency, duration, sample_interval, health_url, seed):
+    """Drive one concurrency level for duration seconds"""
+    sampler = MemorySampler(process, server, sample_interval)
+    sampler.start()
+    poller = HealthPoller(health_url, sample_interval) if health_url else None
+    if poller:
+        poller.start()
+
+    records = []
+    start = time.perf_counter()
+    deadline = start + duration
+    clients = [
+        threading.Thread(target=_client, args=(workload, deadline, seed + i, records), daemon=True)
+        for i in range(concurrency)
+    ]
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join()
+    elapsed = time.perf_counter() - start
+
+    sampler.stop()
+    result = summarize(records, elapsed)
+    result['concurrency'] = concurrency
+    result['elapsed_s'] = round(elapsed, 3)
+    result['memory'] = summarize_memory(sampler.samples)
+    if poller:
+        result['streamlit_health'] = poller.stop()
+    return result
+
+
+def run_model(server, workers, threads, concurrencies, args, resumes, health_url):
+    """Start one worker/thread model and run every concurrency level against it"""
+    env = dict(os.environ, METRICS_ENABLED='0')
+    if not args.cache:
+        # Measure real parsing and scoring instead of cache hits
+        env.update(RESUME_CACHE_SIZE='0', RESUME_CACHE_DB='', RESULT_STORE_DB='')
+    process, base_url, ready_s = start_app(server, workers, threads, env)
+    try:
+        with urllib.request.urlopen(f'{base_url}/api/jobs', timeout=10) as response:
+            job_titles = json.load(response)['jobs']
+        if not job_titles:
+            raise RuntimeError('the job catalog is empty')
+        workload = Workload(base_url, resumes, job_titles, args.mix)
+
+        # Warm every worker a little before measuring
+        warm_up_level = run_level(workload, process, server, max(concurrencies), min(2.0, args.duration),
+                                  args.sample_interval, None, args.seed)
+        levels = {}
+        for concurrency in concurrencies:
+            levels[str(concurrency)] = run_level(workload, process, server, concurrency, args.duration,
+                                                 args.sample_interval, health_url, args.seed)
+        return {
+            'server': server,
+            'workers': workers if server == 'gunicorn' else 1,
+            'threads': threads,
+            'ready_s': round(ready_s, 3),
+            'warm_up_requests': warm_up_level['requests'],
+            'levels': levels
+        }
+    finally:
+        stop(process)
+
+
+def compare(results, baseline, threshold):
+    """List scenarios whose throughput dropped or p95 rose by more than threshold"""
+    regressions = []
+    for key, model in results['models'].items():
+        previous_model = baseline.get('models', {}).get(key)
+        if not previous_model:
+            continue
+        for concurrency, stats in model['levels'].items():
+            previous = previous_model['levels'].get(concurrency)
+            if not previous:
+                continue
+            checks = [
+                ('throughput_rps', previous['throughput_rps'] and
+                 stats['throughput_rps'] < previous['throughput_rps'] * (1 - threshold)),
+                ('p95_ms', previous['p95_ms'] and stats['p95_ms'] is not None and
+                 stats['p95_ms'] > previous['p95_ms'] * (1 + threshold)),
+                ('error_rate', stats['error_rate'] is not None and
+                 stats['error_rate'] > (previous['error_rate'] or 0) + threshold / 10)
+            ]
+            for metric, regressed in checks:
+                if regressed:
+                    regressions.append({
+                        'model': key,
+                        'concurrency': int(concurrency),
+                        'metric': metric,
+                        'baseline': previous[metric],
+                        'current': stats[metric]
+                    })
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Load-test the Flask app with a mix of uploads and catalog reads.')
+    parser.add_argument('--server', choices=['gunicorn', 'flask'], default='gunicorn')
+    parser.add_argument('--workers', type=int, nargs='+', default=[2], help='Gunicorn worker counts to compare')
+    parser.add_argument('--threads', type=int, nargs='+', default=[1],
+                        help='Threads per worker to compare (gthread above 1)')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 8], help='Client threads per level')
+    parser.add_argument('--duration', type=float, default=15.0, help='Seconds per concurrency level')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help=f'Traffic weights per operation (default {DEFAULT_MIX})')
+    parser.add_argument('--files', type=int, default=4, help='Generated resumes per size/format combination')
+    parser.add_argument('--sizes', nargs='+', choices=['small', 'medium', 'large'], default=['small', 'medium'])
+    parser.add_argument('--cache', action='store_true', help='Keep the parse cache and result store enabled')
+    parser.add_argument('--sample-interval', type=float, default=1.0, help='Seconds between memory samples')
+    parser.add_argument('--streamlit', action='store_true', help='Also start the Streamlit app and poll its health')
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('-o', '--output', default='load_results.json', help='Where to write the JSON results')
+    parser.add_argument('--baseline', help='Previous results JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=0.10, help='Allowed regression before flagging (0.10 = 10%%)')
+    args = parser.parse_args(argv)
+
+    resumes = generate_corpus(args.files, sizes=args.sizes, densities=['high'], formats=['pdf', 'docx'], seed=args.seed)
+
+    streamlit = None
+    health_url = None
+    if args.streamlit:
+        streamlit, health_url = start_streamlit(dict(os.environ))
+
+    models = {}
+    try:
+        worker_counts = args.workers if args.server == 'gunicorn' else [1]
+        for workers in worker_counts:
+            for threads in args.threads:
+                key = f'{args.server}-w{workers}-t{threads}' if args.server == 'gunicorn' else f'flask-t{threads}'
+                print(f"{key}: running {len(args.concurrency)} levels of {args.duration:g}s", file=sys.stderr)
+                models[key] = run_model(args.server, workers, threads, args.concurrency, args, resumes, health_url)
+    finally:
+        if streamlit:
+            stop(streamlit)
+
+    results = {
+        'models': models,
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'duration_s': args.duration,
+            'mix': args.mix,
+            'files': len(resumes),
+            'cache': args.cache,
+            'seed': args.seed
+        }
+    }
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        results['regressions'] = compare(results, baseline, args.threshold)
+        if results['regressions']:
+            status = 1
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+
+    print(f"{'model':<20}{'conc':>6}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}"
+          f"{'max RSS kB':>12}")
+    for key, model in models.items():
+        for concurrency, stats in model['levels'].items():
+            peak_rss = max((w['rss_kb_peak'] for w in stats['memory']['workers'].values()), default=0)
+            print(f"{key:<20}{concurrency:>6}{stats['throughput_rps'] or 0:>10.1f}{stats['p50_ms'] or 0:>10.1f}"
+                  f"{stats['p95_ms'] or 0:>10.1f}{stats['p99_ms'] or 0:>10.1f}{stats['error_rate'] or 0:>8.2%}"
+                  f"{peak_rss:>12}")
+    for regression in results.get('regressions', []):
+        print(f"REGRESSION {regression['model']} c={regression['concurrency']} {regression['metric']}: "
+              f"{regression['baseline']} -> {regression['current']}", file=sys.stderr)
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,16 @@
+# Gunicorn settings, picked up automatically by `gunicorn app:app`
+import gc
+
+# Import the app and build its shared state once in the master process
+preload_app = True
+
+
+def when_ready(server):
+    import app
+
+    app.warm_up()
+    # Another worker can't answer a poll for this worker's background job
+    app.app.config['ASYNC_UPLOADS'] = server.cfg.workers == 1
+    # Move everything built so far out of the collector's reach, so garbage
+    # collection in the workers doesn't touch (and copy) the shared pages
+    gc.freeze()
@@ -0,0 +1,172 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from types import MappingProxyType
+
+import numpy as np
+from scipy import sparse
+
+from skill_taxonomy import SKILL_VOCABULARY
+
+JOB_DESCRIPTIONS_PATH = os.environ.get(
+    'JOB_DESCRIPTIONS_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'job_descriptions.json')
+)
+
+# Seconds between stat() calls on the job descriptions file
+RELOAD_CHECK_INTERVAL = 1.0
+
+
+def _freeze(value):
+    """Recursively convert dicts and lists into read-only equivalents"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _dump_json(value):
+    return json.dumps(value, sort_keys=True).encode('utf-8')
+
+
+def _canonical_skills(skills):
+    """Canonical spellings of a job's required skills, deduplicated in catalog order"""
+    return tuple(dict.fromkeys(SKILL_VOCABULARY.canonical(skill) for skill in skills))
+
+
+def _skill_matrix(titles, skill_ids, skill_index):
+    rows, cols = [], []
+    for row, title in enumerate(titles):
+        for skill_id in skill_ids[title]:
+            rows.append(row)
+            cols.append(skill_index[skill_id])
+    return sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.float64), (rows, cols)),
+        shape=(len(titles), len(skill_index))
+    )
+
+
+class JobCatalog:
+    """Immutable snapshot of the job descriptions file with precomputed lookups"""
+
+    def __init__(self, job_data, digest=None):
+        self.digest = digest or hashlib.sha256(_dump_json(job_data)).hexdigest()
+        self.jobs = _freeze(job_data)
+        self.titles = tuple(job_data.keys())
+
+        # Canonical required skills, in catalog order and as sets. Skills the
+        # taxonomy doesn't know are interned so the parser learns to extract them.
+        self.required_skills = MappingProxyType({
+            title: _canonical_skills(job.get('required_skills', []))
+            for title, job in job_data.items()
+        })
+        self.skill_sets = MappingProxyType({
+            title: frozenset(skills) for title, skills in self.required_skills.items()
+        })
+        self.skill_ids = MappingProxyType({
+            title: tuple(SKILL_VOCABULARY.ids(skills)) for title, skills in self.required_skills.items()
+        })
+        # Hash of the fields that affect a job's scores, so re-scoring can
+        # skip jobs whose description and required skills didn't change
+        self.job_hashes = MappingProxyType({
+            title: hashlib.sha256(_dump_json({
+                'description': job.get('description', ''),
+                'required_skills': list(self.required_skills[title])
+            })).hexdigest()
+            for title, job in job_data.items()
+        })
+        self.skill_masks = MappingProxyType({
+            title: SKILL_VOCABULARY.mask(skills) for title, skills in self.required_skills.items()
+        })
+
+        # Job x skill bitmap for scoring skill overlap against every job at once;
+        # skill_index maps a vocabulary id to its column
+        self.skill_index = MappingProxyType({
+            skill_id: i for i, skill_id in enumerate(sorted(set().union(*self.skill_ids.values())))
+        })
+        self.skill_matrix = _skill_matrix(self.titles, self.skill_ids, self.skill_index)
+        self.required_counts = np.array(
+            [len(self.required_skills[title]) for title in self.titles], dtype=np.float64
+        )
+
+        self.resources = MappingProxyType({
+            title: MappingProxyType({
+                SKILL_VOCABULARY.canonical(skill): resource
+                for skill, resource in job.get('resources', {}).items()
+            })
+            for title, job in job_data.items()
+        })
+
+        # Serialized responses for the read-only API endpoints
+        self.jobs_json = _dump_json({'jobs': list(self.titles)})
+        self.job_json = MappingProxyType({
+            title: _dump_json(job) for title, job in job_data.items()
+        })
+
+    def __contains__(self, job_title):
+        return job_title in self.jobs
+
+    def __len__(self):
+        return len(self.titles)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Build a catalog from the raw contents of the job descriptions file"""
+        return cls(json.loads(data), hashlib.sha256(data).hexdigest())
+
+
+_catalog = None
+_signature = None
+_last_check = 0.0
+_lock = threading.Lock()
+
+
+def _reload():
+    """Swap in a new catalog if the file changed since the last load"""
+    global _catalog, _signature
+
+    try:
+        stat = os.stat(JOB_DESCRIPTIONS_PATH)
+    except FileNotFoundError:
+        # Keep the last good catalog; an editor's write-then-rename save
+        # briefly removes the file
+        if _catalog is None:
+            print("Job descriptions file not found!")
+            _catalog = JobCatalog({})
+        return
+
+    signature = (stat.st_mtime_ns, stat.st_size)
+    if _catalog is not None and signature == _signature:
+        return
+
+    try:
+        with open(JOB_DESCRIPTIONS_PATH, 'rb') as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()
+        if _catalog is None or digest != _catalog.digest:
+            _catalog = JobCatalog(json.loads(data), digest)
+    except (OSError, ValueError) as e:
+        print(f"Error loading job descriptions: {e}")
+        if _catalog is None:
+            _catalog = JobCatalog({})
+        return
+
+    _signature = signature
+
+
+def get_catalog():
+    """Return the current job catalog, reloading it if the file changed"""
+    global _last_check
+
+    catalog = _catalog
+    if catalog is not None and time.monotonic() - _last_check < RELOAD_CHECK_INTERVAL:
+        return catalog
+
+    with _lock:
+        if _catalog is None or time.monotonic() - _last_check >= RELOAD_CHECK_INTERVAL:
+            _reload()
+            _last_check = time.monotonic()
+        return _catalog
@@ -1,125 +1,74 @@
-import json
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
+from scipy import sparse
+
+import metrics
+from skill_taxonomy import CATEGORY_NAMES, SKILL_CATEGORY, SKILL_VOCABULARY
+from job_catalog import get_catalog
+from similarity import SEMANTIC_WEIGHT, SKILL_WEIGHT, get_engine
+from tfidf_model import get_model
 
 
 def load_job_descriptions():
-    """Load job descriptions from JSON file"""
-    try:
-        with open('data/job_descriptions.json', 'r') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        print("Job descriptions file not found!")
-        return {}
+    """Return the job descriptions from the in-memory catalog"""
+    return get_catalog().jobs
 
 
 def calculate_semantic_similarity(resume_text, job_description):
-    """Calculate semantic similarity using TF-IDF"""
-    # Use TF-IDF vectorizer instead of sentence transformers
-    vectorizer = TfidfVectorizer(max_features=1000, stop_words='english')
-    
-    try:
-        # Fit and transform both texts
-        tfidf_matrix = vectorizer.fit_transform([resume_text, job_description])
-        
-        # Calculate cosine similarity
-        similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
-        
-        # Convert to percentage
-        match_percentage = round(similarity * 100, 2)
-        
-        return match_percentage
-    except:
-        return 0.0
+    """Calculate semantic similarity using the catalog-fitted TF-IDF model"""
+    vectors = get_model().transform([resume_text, job_description])
+    
+    # Rows are L2-normalized, so the dot product is the cosine similarity
+    similarity = vectors[0].multiply(vectors[1]).sum()
+    
+    # Convert to percentage
+    return round(float(similarity) * 100, 2)
 
 
 def calculate_skill_match(user_skills, required_skills):
     """Calculate percentage of required skills that user has"""
-    if not required_skills:
-        return 0
-    
-    user_skills_lower = [skill.lower().strip() for skill in user_skills]
-    required_skills_lower = [skill.lower().strip() for skill in required_skills]
+    # Compare canonical spellings, so 'postgres' matches 'postgresql'. Skills the
+    # vocabulary doesn't know are compared normalized rather than interned.
+    required = list(dict.fromkeys(map(SKILL_VOCABULARY.canonical, required_skills)))
+    if not required:
+        return 0.0, []
     
-    matched_skills = []
-    for skill in required_skills_lower:
-        if skill in user_skills_lower:
-            matched_skills.append(skill)
+    user = set(map(SKILL_VOCABULARY.canonical, user_skills))
+    matched_skills = [skill for skill in required if skill in user]
     
-    match_percentage = (len(matched_skills) / len(required_skills_lower)) * 100
+    match_percentage = (len(matched_skills) / len(required)) * 100
     
     return round(match_percentage, 2), matched_skills
 
 
 def identify_missing_skills(user_skills, required_skills):
     """Identify skills that are required but not in user's resume"""
-    user_skills_lower = set(skill.lower().strip() for skill in user_skills)
-    required_skills_lower = set(skill.lower().strip() for skill in required_skills)
-    
-    missing_skills = required_skills_lower - user_skills_lower
+    user = set(map(SKILL_VOCABULARY.canonical, user_skills))
     
-    return list(missing_skills)
+    return [skill for skill in dict.fromkeys(map(SKILL_VOCABULARY.canonical, required_skills)) if skill not in user]
 
 
 def categorize_skills(skills):
     """Categorize skills into different categories"""
-    categories = {
-        'Programming Languages': [
-            'python', 'java', 'javascript', 'c++', 'c#', 'ruby', 'php', 
-            'swift', 'kotlin', 'go', 'rust', 'typescript', 'r', 'scala'
-        ],
-        'Web Development': [
-            'html', 'css', 'react', 'angular', 'vue', 'node.js', 'express',
-            'django', 'flask', 'spring', 'bootstrap', 'tailwind', 'sass',
-            'webpack', 'next.js', 'responsive design'
-        ],
-        'Databases': [
-            'sql', 'nosql', 'mongodb', 'postgresql', 'mysql', 'oracle',
-            'redis', 'elasticsearch'
-        ],
-        'Machine Learning & AI': [
-            'machine learning', 'deep learning', 'ai', 'nlp', 'computer vision',
-            'tensorflow', 'pytorch', 'keras', 'scikit-learn', 'neural networks',
-            'cnn', 'rnn', 'lstm', 'transformer'
-        ],
-        'Data Science': [
-            'pandas', 'numpy', 'statistics', 'data visualization', 'tableau',
-            'power bi', 'spark', 'hadoop', 'big data'
-        ],
-        'DevOps & Cloud': [
-            'docker', 'kubernetes', 'jenkins', 'aws', 'azure', 'gcp',
-            'terraform', 'ansible', 'ci/cd', 'linux', 'bash'
-        ],
-        'Design': [
-            'figma', 'sketch', 'adobe xd', 'photoshop', 'illustrator',
-            'ux', 'ui', 'wireframing', 'prototyping'
-        ],
-        'Tools & Others': [
-            'git', 'github', 'jira', 'agile', 'scrum', 'rest api',
-            'graphql', 'testing', 'selenium'
-        ]
-    }
-    
-    categorized = {}
-    skills_lower = [s.lower() for s in skills]
-    
-    for category, keywords in categories.items():
-        matched = [skill for skill in skills_lower if skill in keywords]
-        if matched:
-            categorized[category] = matched
-    
-    return categorized
-
-
-def get_learning_resources(missing_skills, job_title):
+    buckets = {}
+    for skill in skills:
+        skill = SKILL_VOCABULARY.canonical(skill)
+        index = SKILL_CATEGORY.get(skill)
+        if index is not None:
+            buckets.setdefault(index, []).append(skill)
+    
+    # Categories come out in taxonomy order
+    return {CATEGORY_NAMES[index]: buckets[index] for index in sorted(buckets)}
+
+
+def get_learning_resources(missing_skills, job_title, catalog=None):
     """Get learning resources for missing skills"""
-    job_data = load_job_descriptions()
+    if catalog is None:
+        catalog = get_catalog()
     
-    if job_title not in job_data:
+    if job_title not in catalog:
         return {}
     
-    resources = job_data[job_title].get('resources', {})
+    resources = catalog.resources[job_title]
     
     relevant_resources = {}
     for skill in missing_skills:
@@ -129,62 +78,238 @@ def get_learning_resources(missing_skills, job_title):
     return relevant_resources
 
 
-def analyze_resume_for_job(resume_data, job_title):
+class MatchResult:
+    """Compact result of matching one resume against one catalog job
+
+    Skills are kept as vocabulary bitmasks and the job as its index in the
+    catalog; to_dict() expands them into the JSON shape the API returns.
+    """
+
+    __slots__ = (
+        'catalog', 'job_id', 'overall_match', 'semantic_match', 'skill_match',
+        'user_mask', 'matched_mask', 'missing_mask', 'email', 'phone'
+    )
+
+    def __init__(self, catalog, job_id, semantic_match, skill_match, user_mask,
+                 email=None, phone=None):
+        required_mask = catalog.skill_masks[catalog.titles[job_id]]
+        self.catalog = catalog
+        self.job_id = job_id
+        self.semantic_match = semantic_match
+        self.skill_match = skill_match
+        self.overall_match = round(semantic_match * SEMANTIC_WEIGHT + skill_match * SKILL_WEIGHT, 2)
+        self.user_mask = user_mask
+        self.matched_mask = user_mask & required_mask
+        self.missing_mask = required_mask & ~user_mask
+        self.email = email
+        self.phone = phone
+
+    @property
+    def job_title(self):
+        return self.catalog.titles[self.job_id]
+
+    @property
+    def total_required_skills(self):
+        return len(self.catalog.required_skills[self.job_title])
+
+    @property
+    def matched_skills(self):
+        return sorted(SKILL_VOCABULARY.names_from_mask(self.matched_mask))
+
+    @property
+    def missing_skills(self):
+        return sorted(SKILL_VOCABULARY.names_from_mask(self.missing_mask))
+
+    def to_dict(self, detail=True):
+        """Serialize to the analysis JSON shape; detail adds categories, resources and the description"""
+        missing_skills = self.missing_skills
+        result = {
+            'job_title': self.job_title,
+            'overall_match': self.overall_match,
+            'semantic_match': self.semantic_match,
+            'skill_match': self.skill_match,
+            'total_required_skills': self.total_required_skills,
+            'matched_skills_count': self.matched_mask.bit_count(),
+            'missing_skills_count': len(missing_skills),
+            'matched_skills': self.matched_skills,
+            'missing_skills': missing_skills,
+            'email': self.email,
+            'phone': self.phone
+        }
+        if detail:
+            timer = metrics.stage_timer()
+            user_skills = sorted(SKILL_VOCABULARY.names_from_mask(self.user_mask))
+            with timer('categorization'):
+                categorized_user_skills = categorize_skills(user_skills)
+                categorized_missing_skills = categorize_skills(missing_skills)
+            with timer('resources'):
+                learning_resources = get_learning_resources(missing_skills, self.job_title, self.catalog)
+            timer.finish()
+            result.update({
+                'user_skills': user_skills,
+                'categorized_user_skills': categorized_user_skills,
+                'categorized_missing_skills': categorized_missing_skills,
+                'learning_resources': learning_resources,
+                'job_description': self.catalog.jobs[self.job_title]['description']
+            })
+        return result
+
+
+def match_resume(resume_data, job_title, engine=None):
+    """Score a parsed resume against one job; returns a MatchResult, or None for an unknown job
+
+    engine is a similarity engine or its name (see similarity.ENGINES); SIMILARITY_ENGINE by default.
+    """
+    engine = get_engine(engine)
+    catalog = engine.catalog
+    
+    job_id = engine.job_index.get(job_title)
+    if job_id is None:
+        metrics.inc('resume_errors_total', stage='job_title')
+        return None
+    
+    required_skills = catalog.required_skills[job_title]
+    timer = metrics.stage_timer()
+    
+    # Calculate semantic similarity against the precomputed job vector
+    with timer('similarity'):
+        semantic_match = engine.similarity(resume_data['cleaned_text'], job_title)
+    
+    with timer('skill_match'):
+        # Skill-based match as bitmask operations against the precomputed job mask
+        user_mask = SKILL_VOCABULARY.mask(resume_data['skills'])
+        matched_count = (user_mask & catalog.skill_masks[job_title]).bit_count()
+        skill_match = (
+            round(matched_count / len(required_skills) * 100, 2) if required_skills else 0
+        )
+    
+    timer.finish()
+    
+    return MatchResult(
+        catalog, job_id, semantic_match, skill_match, user_mask,
+        resume_data.get('email'), resume_data.get('phone')
+    )
+
+
+def analyze_resume_for_job(resume_data, job_title, engine=None):
     """Main function to analyze resume against job requirements"""
-    job_descriptions = load_job_descriptions()
+    result = match_resume(resume_data, job_title, engine)
     
-    if job_title not in job_descriptions:
+    if result is None:
         return {
             'error': f'Job title "{job_title}" not found in database.'
         }
     
-    job_data = job_descriptions[job_title]
-    job_description = job_data['description']
-    required_skills = job_data['required_skills']
+    return result.to_dict()
+
+
+def rank_jobs(resume_data, top_k=5, engine=None):
+    """Rank every job in the catalog against one resume in a single vectorized pass"""
+    engine = get_engine(engine)
+    catalog = engine.catalog
+    
+    if not catalog.titles:
+        return []
     
-    # Calculate semantic similarity
-    semantic_match = calculate_semantic_similarity(
-        resume_data['cleaned_text'],
-        job_description
-    )
+    # Semantic similarity against all job vectors with one sparse product
+    semantic = np.round(engine.similarities(resume_data['cleaned_text']) * 100, 2)
     
-    # Calculate skill-based match
-    skill_match, matched_skills = calculate_skill_match(
-        resume_data['skills'],
-        required_skills
-    )
+    # Skill overlap for all jobs: job x skill bitmap times the resume's skill vector
+    resume_skills = np.zeros(len(catalog.skill_index), dtype=np.float64)
+    for skill in resume_data['skills']:
+        index = catalog.skill_index.get(SKILL_VOCABULARY.lookup(skill))
+        if index is not None:
+            resume_skills[index] = 1.0
+    matched_counts = catalog.skill_matrix @ resume_skills
+    skill = np.round(np.divide(
+        matched_counts * 100,
+        catalog.required_counts,
+        out=np.zeros_like(matched_counts),
+        where=catalog.required_counts > 0
+    ), 2)
     
-    # Identify missing skills
-    missing_skills = identify_missing_skills(
-        resume_data['skills'],
-        required_skills
+    overall = np.round(semantic * SEMANTIC_WEIGHT + skill * SKILL_WEIGHT, 2)
+    
+    # Highest overall match first; ties keep catalog order
+    order = np.lexsort((np.arange(len(overall)), -overall))[:max(0, int(top_k))]
+    
+    return [
+        {
+            'job_title': catalog.titles[i],
+            'overall_match': float(overall[i]),
+            'semantic_match': float(semantic[i]),
+            'skill_match': float(skill[i]),
+            'total_required_skills': int(catalog.required_counts[i]),
+            'matched_skills_count': int(matched_counts[i])
+        }
+        for i in order
+    ]
+
+
+def compare_resumes(resumes, job_title, engine=None):
+    """Score many parsed resumes against one job in a single vectorized pass
+
+    Returns one row per resume, best match first; 'index' points back into
+    the input list. Returns None if the job title is unknown.
+    """
+    engine = get_engine(engine)
+    catalog = engine.catalog
+    
+    if job_title not in catalog:
+        metrics.inc('resume_errors_total', stage='job_title')
+        return None
+    if not resumes:
+        return []
+    
+    job_row = engine.job_index[job_title]
+    required_count = len(catalog.required_skills[job_title])
+    
+    # All resume vectors stacked into one matrix and scored with one product
+    vectors = engine.transform([resume_data['cleaned_text'] for resume_data in resumes])
+    semantic = np.round((vectors @ engine.job_matrix[job_row].T).toarray().ravel() * 100, 2)
+    
+    # Resume x skill bitmap times the job's column of the catalog bitmap
+    rows, cols = [], []
+    for row, resume_data in enumerate(resumes):
+        for skill in resume_data['skills']:
+            index = catalog.skill_index.get(SKILL_VOCABULARY.lookup(skill))
+            if index is not None:
+                rows.append(row)
+                cols.append(index)
+    resume_skills = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.float64), (rows, cols)),
+        shape=(len(resumes), len(catalog.skill_index))
     )
+    # Guard against a resume listing the same skill twice
+    resume_skills.data[:] = 1.0
+    matched_counts = (resume_skills @ catalog.skill_matrix[job_row].T).toarray().ravel()
+    if required_count:
+        skill = np.round(matched_counts * 100 / required_count, 2)
+    else:
+        skill = np.zeros(len(resumes))
+    
+    overall = np.round(semantic * SEMANTIC_WEIGHT + skill * SKILL_WEIGHT, 2)
+    
+    # Highest overall match first; ties keep upload order
+    order = np.lexsort((np.arange(len(overall)), -overall))
+    required_mask = catalog.skill_masks[job_title]
     
-    # Categorize user skills
-    categorized_user_skills = categorize_skills(resume_data['skills'])
-    
-    # Categorize missing skills
-    categorized_missing_skills = categorize_skills(missing_skills)
-    
-    # Get learning resources
-    learning_resources = get_learning_resources(missing_skills, job_title)
-    
-    # Calculate overall match (weighted average)
-    overall_match = round((semantic_match * 0.4 + skill_match * 0.6), 2)
-    
-    return {
-        'job_title': job_title,
-        'overall_match': overall_match,
-        'semantic_match': semantic_match,
-        'skill_match': skill_match,
-        'total_required_skills': len(required_skills),
-        'matched_skills_count': len(matched_skills),
-        'missing_skills_count': len(missing_skills),
-        'matched_skills': sorted(matched_skills),
-        'missing_skills': sorted(missing_skills),
-        'user_skills': sorted(resume_data['skills']),
-        'categorized_user_skills': categorized_user_skills,
-        'categorized_missing_skills': categorized_missing_skills,
-        'learning_resources': learning_resources,
-        'job_description': job_description
-    }
\ No newline at end of file
+    results = []
+    for rank, i in enumerate(order, start=1):
+        user_mask = SKILL_VOCABULARY.mask(resumes[i]['skills'])
+        missing_skills = SKILL_VOCABULARY.names_from_mask(required_mask & ~user_mask)
+        results.append({
+            'rank': rank,
+            'index': int(i),
+            'overall_match': float(overall[i]),
+            'semantic_match': float(semantic[i]),
+            'skill_match': float(skill[i]),
+            'total_required_skills': required_count,
+            'matched_skills_count': int(matched_counts[i]),
+            'missing_skills_count': len(missing_skills),
+            'matched_skills': sorted(SKILL_VOCABULARY.names_from_mask(required_mask & user_mask)),
+            'missing_skills': sorted(missing_skills),
+            'email': resumes[i].get('email'),
+            'phone': resumes[i].get('phone')
+        })
+    return results
@@ -0,0 +1,252 @@
+import contextlib
+import os
+import threading
+import time
+
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '1').lower() not in ('0', 'false', 'no')
+TIMING_HEADERS = os.environ.get('TIMING_HEADERS', '0').lower() in ('1', 'true', 'yes')
+
+SECONDS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BYTES_BUCKETS = (10e3, 50e3, 100e3, 500e3, 1e6, 5e6, 16e6)
+PAGES_BUCKETS = (1, 2, 3, 5, 10, 20, 50)
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (
+        (name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in pairs
+    )
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+
+def _format_value(value):
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Registry:
+    """Counters and histograms rendered in the Prometheus text format"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self._help = {}
+        self._collectors = []
+
+    def describe(self, name, text):
+        self._help[name] = text
+
+    def inc(self, name, value=1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name, value, buckets=SECONDS_BUCKETS, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            histogram = self._histograms.setdefault(name, {'buckets': buckets, 'series': {}})
+            series = histogram['series'].get(key)
+            if series is None:
+                series = histogram['series'][key] = {
+                    'counts': [0] * len(histogram['buckets']), 'sum': 0.0, 'count': 0
+                }
+            for i, bound in enumerate(histogram['buckets']):
+                if value <= bound:
+                    series['counts'][i] += 1
+            series['sum'] += value
+            series['count'] += 1
+
+    def add_collector(self, collector):
+        """Register a callable returning [(name, type, {labels: value})] at render time"""
+        self._collectors.append(collector)
+
+    def render(self):
+        lines = []
+
+        def header(name, kind):
+            if name in self._help:
+                lines.append(f'# HELP {name} {self._help[name]}')
+            lines.append(f'# TYPE {name} {kind}')
+
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                header(name, 'counter')
+                for key, value in sorted(series.items()):
+                    lines.append(f'{name}{_format_labels(key)} {_format_value(value)}')
+
+            for name, histogram in sorted(self._histograms.items()):
+                header(name, 'histogram')
+                for key, series in sorted(histogram['series'].items()):
+                    for bound, count in zip(histogram['buckets'], series['counts']):
+                        lines.append(f'{name}_bucket{_format_labels(key, [("le", _format_value(bound))])} {count}')
+                    lines.append(f'{name}_bucket{_format_labels(key, [("le", "+Inf")])} {series["count"]}')
+                    lines.append(f'{name}_sum{_format_labels(key)} {_format_value(series["sum"])}')
+                    lines.append(f'{name}_count{_format_labels(key)} {series["count"]}')
+
+        for collector in self._collectors:
+            for name, kind, series in collector():
+                header(name, kind)
+                for labels, value in series.items():
+                    lines.append(f'{name}{_format_labels(_label_key(dict(labels)))} {_format_value(value)}')
+
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+registry.describe('resume_stage_seconds', 'Time spent in each parse/analysis stage per resume')
+registry.describe('resume_file_bytes', 'Size of parsed resume files')
+registry.describe('resume_pdf_pages', 'Pages extracted per PDF resume')
+registry.describe('resume_errors_total', 'Resumes that failed to parse or analyze')
+registry.describe('http_request_duration_seconds', 'Flask request latency by endpoint')
+
+_request = threading.local()
+
+# Metrics recorded inside recording() are collected here instead of applied
+_recorded = threading.local()
+
+
+def _records():
+    return getattr(_recorded, 'records', None)
+
+
+class _NullTimer:
+    """Stand-in used when instrumentation is disabled"""
+
+    def __call__(self, stage):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def finish(self):
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Stage:
+    __slots__ = ('timer', 'stage', 'start')
+
+    def __init__(self, timer, stage):
+        self.timer = timer
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.start
+        self.timer.totals[self.stage] = self.timer.totals.get(self.stage, 0.0) + elapsed
+        return False
+
+
+class StageTimer:
+    """Accumulates time per stage for one resume, then records the totals"""
+
+    def __init__(self):
+        self.totals = {}
+
+    def __call__(self, stage):
+        return _Stage(self, stage)
+
+    def finish(self):
+        for stage, seconds in self.totals.items():
+            _record_stage(stage, seconds)
+
+
+def _record_stage(stage, seconds):
+    records = _records()
+    if records is not None:
+        records.append(('stage', stage, seconds))
+        return
+    registry.observe('resume_stage_seconds', seconds, stage=stage)
+    timings = getattr(_request, 'timings', None)
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + seconds
+
+
+def stage_timer():
+    """Return a timer for one resume; a shared no-op object when metrics are disabled"""
+    return StageTimer() if METRICS_ENABLED else _NULL_TIMER
+
+
+def inc(name, value=1, **labels):
+    if METRICS_ENABLED:
+        records = _records()
+        if records is not None:
+            records.append(('inc', name, value, labels))
+        else:
+            registry.inc(name, value, **labels)
+
+
+def observe(name, value, buckets=SECONDS_BUCKETS, **labels):
+    if METRICS_ENABLED:
+        records = _records()
+        if records is not None:
+            records.append(('observe', name, value, buckets, labels))
+        else:
+            registry.observe(name, value, buckets, **labels)
+
+
+@contextlib.contextmanager
+def recording():
+    """Collect the metrics recorded in this block into a list instead of the registry
+
+    Worker processes have their own registry, so a pool task records its
+    metrics this way and returns them for replay() in the parent.
+    """
+    records = []
+    _recorded.records = records
+    try:
+        yield records
+    finally:
+        _recorded.records = None
+
+
+def replay(records):
+    """Apply metrics collected by recording(), e.g. in another process"""
+    for kind, *args in records:
+        if kind == 'stage':
+            _record_stage(*args)
+        elif kind == 'inc':
+            name, value, labels = args
+            inc(name, value, **labels)
+        else:
+            name, value, buckets, labels = args
+            observe(name, value, buckets, **labels)
+
+
+def start_request():
+    """Begin collecting stage timings for the current request thread"""
+    _request.timings = {} if TIMING_HEADERS else None
+    _request.start = time.perf_counter()
+
+
+def finish_request(endpoint, response):
+    """Record request latency and attach a Server-Timing header if enabled"""
+    start = getattr(_request, 'start', None)
+    if start is not None:
+        observe('http_request_duration_seconds', time.perf_counter() - start, endpoint=endpoint or 'unknown')
+
+    timings = getattr(_request, 'timings', None)
+    # A streamed body is produced after this runs, so there is nothing to report yet
+    if timings and not response.is_streamed:
+        response.headers['Server-Timing'] = ', '.join(
+            f'{stage.replace("_", "-")};dur={seconds * 1000:.2f}' for stage, seconds in timings.items()
+        )
+    _request.timings = None
+    _request.start = None
+    return response
@@ -0,0 +1,303 @@
+"""Persistent store of computed (resume, job) match results.
+
+Results are keyed by the resume's content hash, the job title, the job's hash
+in the catalog and a scoring version. The scoring version covers the engine,
+its fitted state, the weights, and the parser with its skill vocabulary. A
+repeat analysis of the same file against an unchanged job is then one
+primary-key read, and any change that could alter the score simply misses.
+
+Drop expired rows from the command line:
+    python result_store.py cleanup
+"""
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+import metrics
+from job_matcher import MatchResult
+from resume_parser import extraction_version
+from similarity import SEMANTIC_WEIGHT, SKILL_WEIGHT, get_engine
+from skill_taxonomy import SKILL_VOCABULARY
+
+# Bump when the way scores are computed changes in a way the other inputs don't capture
+SCORING_VERSION = 1
+
+# Seconds between opportunistic TTL cleanups on write
+CLEANUP_INTERVAL = 60.0
+
+# Most digests per IN (...) lookup, below SQLite's bound-parameter limit
+LOOKUP_CHUNK = 500
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS match_results (
+    resume_digest TEXT NOT NULL,
+    job_title TEXT NOT NULL,
+    job_hash TEXT NOT NULL,
+    scoring_version TEXT NOT NULL,
+    overall_match REAL NOT NULL,
+    semantic_match REAL NOT NULL,
+    skill_match REAL NOT NULL,
+    user_skills TEXT NOT NULL,
+    matched_skills TEXT NOT NULL,
+    missing_skills TEXT NOT NULL,
+    email TEXT,
+    phone TEXT,
+    created REAL NOT NULL,
+    PRIMARY KEY (resume_digest, job_title, job_hash, scoring_version)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS match_results_job
+    ON match_results (job_title, job_hash, scoring_version, overall_match DESC);
+CREATE INDEX IF NOT EXISTS match_results_created ON match_results (created);
+'''
+
+COLUMNS = (
+    'resume_digest, job_title, overall_match, semantic_match, skill_match, '
+    'user_skills, matched_skills, missing_skills, email, phone, created'
+)
+
+
+def scoring_version(engine):
+    """Short hash of everything besides the resume and job that a score depends on"""
+    parts = [SCORING_VERSION, extraction_version(), engine.version, SEMANTIC_WEIGHT, SKILL_WEIGHT]
+    return hashlib.sha256(json.dumps(parts).encode('utf-8')).hexdigest()[:16]
+
+
+def _row_dict(row):
+    return {
+        'resume_hash': row[0],
+        'job_title': row[1],
+        'overall_match': row[2],
+        'semantic_match': row[3],
+        'skill_match': row[4],
+        'matched_skills': json.loads(row[6]),
+        'missing_skills': json.loads(row[7]),
+        'email': row[8],
+        'phone': row[9],
+        'created': row[10]
+    }
+
+
+class ResultStore:
+    """SQLite table of match results with TTL expiry; disabled when db_path is empty"""
+
+    def __init__(self, db_path=None, ttl=7 * 24 * 3600):
+        self.db_path = db_path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._db = None
+        self._db_pid = None
+        self._last_cleanup = 0.0
+
+    @classmethod
+    def from_env(cls):
+        """Configure from RESULT_STORE_DB and RESULT_STORE_TTL"""
+        return cls(
+            db_path=os.environ.get('RESULT_STORE_DB') or None,
+            ttl=float(os.environ.get('RESULT_STORE_TTL', 7 * 24 * 3600))
+        )
+
+    def _connection(self):
+        # SQLite connections must not cross a fork, so open one per process
+        if self._db is None or self._db_pid != os.getpid():
+            self._db = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+            self._db.executescript(SCHEMA)
+            self._db.commit()
+            self._db_pid = os.getpid()
+        return self._db
+
+    def _version(self, engine, job_title):
+        """(engine, job hash, scoring version) for a job, or None if the job is unknown"""
+        engine = get_engine(engine)
+        job_hash = engine.catalog.job_hashes.get(job_title)
+        if job_hash is None:
+            return None
+        return engine, job_hash, scoring_version(engine)
+
+    def get_many(self, digests, job_title, engine=None):
+        """Stored MatchResults for the given resume digests against one job, as {digest: result}"""
+        if not self.db_path or not digests:
+            return {}
+        version = self._version(engine, job_title)
+        if version is None:
+            return {}
+        engine, job_hash, scoring = version
+        catalog = engine.catalog
+        job_id = engine.job_index[job_title]
+
+        digests = list(dict.fromkeys(digests))
+        found = {}
+        try:
+            with self._lock:
+                db = self._connection()
+                for start in range(0, len(digests), LOOKUP_CHUNK):
+                    chunk = digests[start:start + LOOKUP_CHUNK]
+                    rows = db.execute(
+                        'SELECT resume_digest, semantic_match, skill_match, user_skills, email, phone '
+                        'FROM match_results WHERE job_title = ? AND job_hash = ? AND scoring_version = ? '
+                        f'AND created >= ? AND resume_digest IN ({", ".join("?" * len(chunk))})',
+                        (job_title, job_hash, scoring, time.time() - self.ttl, *chunk)
+                    ).fetchall()
+                    for digest, semantic, skill, user_skills, email, phone in rows:
+                        found[digest] = MatchResult(
+                            catalog, job_id, semantic, skill,
+                            SKILL_VOCABULARY.mask(json.loads(user_skills)), email, phone
+                        )
+        except sqlite3.Error as e:
+            print(f"Result store error: {e}")
+            return {}
+
+        metrics.inc('result_store_requests_total', len(found), result='hit')
+        metrics.inc('result_store_requests_total', len(digests) - len(found), result='miss')
+        return found
+
+    def get(self, digest, job_title, engine=None):
+        """Stored MatchResult for one resume digest and job, or None"""
+        return self.get_many([digest], job_title, engine).get(digest)
+
+    def put_many(self, items, engine=None):
+        """Store (digest, MatchResult) pairs in one transaction"""
+        if not self.db_path or not items:
+            return
+        engine = get_engine(engine)
+        scoring = scoring_version(engine)
+        now = time.time()
+        rows = []
+        for digest, result in items:
+            job_title = result.job_title
+            rows.append((
+                digest, job_title, result.catalog.job_hashes[job_title], scoring,
+                result.overall_match, result.semantic_match, result.skill_match,
+                json.dumps(sorted(SKILL_VOCABULARY.names_from_mask(result.user_mask))),
+                json.dumps(result.matched_skills), json.dumps(result.missing_skills),
+                result.email, result.phone, now
+            ))
+        try:
+            with self._lock:
+                db = self._connection()
+                db.executemany(
+                    'INSERT OR REPLACE INTO match_results (resume_digest, job_title, job_hash, scoring_version, '
+                    'overall_match, semantic_match, skill_match, user_skills, matched_skills, missing_skills, '
+                    'email, phone, created) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    rows
+                )
+                if now - self._last_cleanup >= CLEANUP_INTERVAL:
+                    self._cleanup(db, now)
+                db.commit()
+        except sqlite3.Error as e:
+            print(f"Result store error: {e}")
+
+    def put(self, digest, result, engine=None):
+        """Store one MatchResult under the resume's digest"""
+        self.put_many([(digest, result)], engine)
+
+    def for_resume(self, digest, engine=None):
+        """Current results for one resume against every job, best match first"""
+        if not self.db_path:
+            return []
+        engine = get_engine(engine)
+        job_hashes = engine.catalog.job_hashes
+        try:
+            with self._lock:
+                rows = self._connection().execute(
+                    f'SELECT {COLUMNS}, job_hash FROM match_results '
+                    'WHERE resume_digest = ? AND scoring_version = ? AND created >= ? '
+                    'ORDER BY overall_match DESC',
+                    (digest, scoring_version(engine), time.time() - self.ttl)
+                ).fetchall()
+        except sqlite3.Error as e:
+            print(f"Result store error: {e}")
+            return []
+        # Rows for an older version of a job are stale
+        return [_row_dict(row) for row in rows if job_hashes.get(row[1]) == row[-1]]
+
+    def for_job(self, job_title, top_k=20, engine=None):
+        """Current results for one job across all stored resumes, best match first"""
+        version = self._version(engine, job_title)
+        if version is None:
+            return None
+        if not self.db_path:
+            return []
+        _, job_hash, scoring = version
+        try:
+            with self._lock:
+                rows = self._connection().execute(
+                    f'SELECT {COLUMNS} FROM match_results '
+                    'WHERE job_title = ? AND job_hash = ? AND scoring_version = ? AND created >= ? '
+                    'ORDER BY overall_match DESC LIMIT ?',
+                    (job_title, job_hash, scoring, time.time() - self.ttl, max(0, int(top_k)))
+                ).fetchall()
+        except sqlite3.Error as e:
+            print(f"Result store error: {e}")
+            return []
+        return [_row_dict(row) for row in rows]
+
+    def _cleanup(self, db, now):
+        self._last_cleanup = now
+        return db.execute('DELETE FROM match_results WHERE created < ?', (now - self.ttl,)).rowcount
+
+    def cleanup(self):
+        """Delete results older than the TTL; returns how many were removed"""
+        if not self.db_path:
+            return 0
+        with self._lock:
+            db = self._connection()
+            removed = self._cleanup(db, time.time())
+            db.commit()
+            return removed
+
+    def clear(self):
+        if not self.db_path:
+            return
+        with self._lock:
+            db = self._connection()
+            db.execute('DELETE FROM match_results')
+            db.commit()
+
+    def stats(self):
+        """Row count of the store"""
+        if not self.db_path:
+            return {'entries': 0}
+        try:
+            with self._lock:
+                count = self._connection().execute('SELECT COUNT(*) FROM match_results').fetchone()[0]
+        except sqlite3.Error as e:
+            print(f"Result store error: {e}")
+            return {'entries': 0}
+        return {'entries': count}
+
+
+result_store = ResultStore.from_env()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Manage the match result store.')
+    subcommands = parser.add_subparsers(dest='command', required=True)
+    subcommands.add_parser('cleanup', help='Delete results older than RESULT_STORE_TTL')
+    job_parser = subcommands.add_parser('job', help='Best stored results for a job')
+    job_parser.add_argument('job_title')
+    job_parser.add_argument('--top-k', type=int, default=20)
+    resume_parser = subcommands.add_parser('resume', help='Stored results for one resume hash')
+    resume_parser.add_argument('digest')
+    args = parser.parse_args(argv)
+
+    if args.command == 'cleanup':
+        print(f"Removed {result_store.cleanup()} expired results", file=sys.stderr)
+    elif args.command == 'job':
+        results = result_store.for_job(args.job_title, args.top_k)
+        if results is None:
+            parser.error(f'unknown job title: {args.job_title}')
+        for result in results:
+            print(json.dumps(result))
+    else:
+        for result in result_store.for_resume(args.digest):
+            print(json.dumps(result))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
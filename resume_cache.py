@@ -0,0 +1,297 @@
+import hashlib
+import io
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import metrics
+from resume_parser import extraction_version, open_source, parse_resume
+
+# Fields of the parse_resume output worth keeping
+CACHED_FIELDS = ('cleaned_text', 'skills', 'email', 'phone', 'skill_count')
+
+# Worker processes used to parse a batch of resumes in parallel
+PARSE_WORKERS = int(os.environ.get('PARSE_WORKERS', min(4, os.cpu_count() or 1)))
+
+
+def content_digest(data):
+    """SHA-256 hex digest of an uploaded file's bytes"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def _cache_key(digest, version=None):
+    # Entries written by another parser or skill vocabulary are never returned
+    return f"{digest}:{version or extraction_version()}"
+
+
+class ResumeCache:
+    """Parsed-resume cache keyed by content hash, with an LRU memory tier and optional SQLite tier"""
+
+    def __init__(self, max_entries=128, db_path=None, max_disk_bytes=256 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.db_path = db_path
+        self.max_disk_bytes = max_disk_bytes
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._db_pid = None
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls):
+        """Configure from RESUME_CACHE_SIZE, RESUME_CACHE_DB and RESUME_CACHE_MAX_BYTES"""
+        return cls(
+            max_entries=int(os.environ.get('RESUME_CACHE_SIZE', 128)),
+            db_path=os.environ.get('RESUME_CACHE_DB') or None,
+            max_disk_bytes=int(os.environ.get('RESUME_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+        )
+
+    def _connection(self):
+        # SQLite connections must not cross a fork, so open one per process
+        if self._db is None or self._db_pid != os.getpid():
+            self._db = sqlite3.connect(self.db_path, timeout=10, check_same_thread=False)
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS parsed_resumes ('
+                'digest TEXT PRIMARY KEY, data BLOB NOT NULL, '
+                'size INTEGER NOT NULL, accessed REAL NOT NULL)'
+            )
+            self._db.execute(
+                'CREATE INDEX IF NOT EXISTS parsed_resumes_accessed ON parsed_resumes (accessed)'
+            )
+            self._db.commit()
+            self._db_pid = os.getpid()
+        return self._db
+
+    def _remember(self, digest, resume_data):
+        self._memory[digest] = resume_data
+        self._memory.move_to_end(digest)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, digest, version=None):
+        """Return the cached parse result for a digest, or None"""
+        digest = _cache_key(digest, version)
+        with self._lock:
+            resume_data = self._memory.get(digest)
+            if resume_data is not None:
+                self._memory.move_to_end(digest)
+                self.hits += 1
+                return _copy(resume_data)
+
+            if self.db_path:
+                try:
+                    db = self._connection()
+                    row = db.execute(
+                        'SELECT data FROM parsed_resumes WHERE digest = ?', (digest,)
+                    ).fetchone()
+                    if row is not None:
+                        db.execute(
+                            'UPDATE parsed_resumes SET accessed = ? WHERE digest = ?',
+                            (time.time(), digest)
+                        )
+                        db.commit()
+                        resume_data = json.loads(zlib.decompress(row[0]))
+                        self._remember(digest, resume_data)
+                        self.hits += 1
+                        self.disk_hits += 1
+                        return _copy(resume_data)
+                except sqlite3.Error as e:
+                    print(f"Resume cache error: {e}")
+
+            self.misses += 1
+            return None
+
+    def put(self, digest, resume_data, version=None):
+        """Store a successful parse result made with the given extraction version (default: current)"""
+        digest = _cache_key(digest, version)
+        resume_data = _copy({field: resume_data.get(field) for field in CACHED_FIELDS})
+        with self._lock:
+            self._remember(digest, resume_data)
+
+            if self.db_path:
+                try:
+                    blob = zlib.compress(json.dumps(resume_data).encode('utf-8'))
+                    db = self._connection()
+                    db.execute(
+                        'INSERT OR REPLACE INTO parsed_resumes (digest, data, size, accessed) '
+                        'VALUES (?, ?, ?, ?)',
+                        (digest, blob, len(blob), time.time())
+                    )
+                    self._evict(db)
+                    db.commit()
+                except sqlite3.Error as e:
+                    print(f"Resume cache error: {e}")
+
+    def _evict(self, db):
+        """Drop least recently used rows until the disk tier fits in max_disk_bytes"""
+        total = db.execute('SELECT COALESCE(SUM(size), 0) FROM parsed_resumes').fetchone()[0]
+        if total <= self.max_disk_bytes:
+            return
+        rows = db.execute('SELECT digest, size FROM parsed_resumes ORDER BY accessed').fetchall()
+        stale = []
+        for digest, size in rows:
+            if total <= self.max_disk_bytes:
+                break
+            stale.append((digest,))
+            total -= size
+        db.executemany('DELETE FROM parsed_resumes WHERE digest = ?', stale)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self.db_path:
+                db = self._connection()
+                db.execute('DELETE FROM parsed_resumes')
+                db.commit()
+
+    def stats(self):
+        """Hit/miss counters and current sizes"""
+        with self._lock:
+            stats = {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'memory_entries': len(self._memory),
+                'max_entries': self.max_entries
+            }
+            if self.db_path:
+                try:
+                    count, size = self._connection().execute(
+                        'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM parsed_resumes'
+                    ).fetchone()
+                    stats.update(disk_entries=count, disk_bytes=size, max_disk_bytes=self.max_disk_bytes)
+                except sqlite3.Error as e:
+                    print(f"Resume cache error: {e}")
+            return stats
+
+
+def _copy(resume_data):
+    resume_data = dict(resume_data)
+    resume_data['skills'] = list(resume_data['skills'])
+    return resume_data
+
+
+resume_cache = ResumeCache.from_env()
+
+
+def parse_resume_cached(source, cache=None):
+    """Parse a resume (path, bytes or stream), reusing a previous result for identical contents"""
+    if cache is None:
+        cache = resume_cache
+
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        data = bytes(source)
+    else:
+        stream = open_source(source)
+        try:
+            data = stream.read()
+        finally:
+            if stream is not source:
+                stream.close()
+    digest = content_digest(data)
+
+    resume_data = cache.get(digest)
+    if resume_data is not None:
+        metrics.inc('resume_cache_requests_total', result='hit')
+        return resume_data
+    metrics.inc('resume_cache_requests_total', result='miss')
+
+    resume_data, version = _parse_bytes(data)
+    if 'error' not in resume_data:
+        cache.put(digest, resume_data, version)
+    return resume_data
+
+
+def _parse_bytes(data):
+    """Parse bytes; returns (resume_data, extraction version of the process that parsed them)"""
+    resume_data = parse_resume(io.BytesIO(data))
+    version = extraction_version()
+    if 'error' in resume_data:
+        return resume_data, version
+    return {field: resume_data.get(field) for field in CACHED_FIELDS}, version
+
+
+def _parse_bytes_in_worker(data):
+    """_parse_bytes for a pool process, also returning its metrics for the parent to record"""
+    with metrics.recording() as records:
+        resume_data, version = _parse_bytes(data)
+    return resume_data, version, records
+
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def _parse_pool():
+    """Process pool shared by every batch in this process, started on first use"""
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = ProcessPoolExecutor(max_workers=PARSE_WORKERS)
+            _pool_pid = os.getpid()
+        return _pool
+
+
+def iter_parse_cached(sources, cache=None):
+    """Parse a batch of resume bytes, yielding (index, resume_data) as each one finishes
+
+    Cached contents come out first; the remaining distinct files are parsed
+    in parallel on the shared process pool and yielded in completion order.
+    """
+    if cache is None:
+        cache = resume_cache
+
+    pending = {}
+    for index, data in enumerate(sources):
+        digest = content_digest(data)
+        if digest in pending:
+            pending[digest][1].append(index)
+            continue
+        resume_data = cache.get(digest)
+        if resume_data is not None:
+            metrics.inc('resume_cache_requests_total', result='hit')
+            yield index, resume_data
+        else:
+            metrics.inc('resume_cache_requests_total', result='miss')
+            pending[digest] = (data, [index])
+
+    def finish(digest, resume_data, version=None):
+        if 'error' not in resume_data:
+            cache.put(digest, resume_data, version)
+        indexes = pending[digest][1]
+        for index in indexes:
+            yield index, (_copy(resume_data) if 'error' not in resume_data and index != indexes[0]
+                          else resume_data)
+
+    if len(pending) > 1 and PARSE_WORKERS > 1:
+        pool = _parse_pool()
+        futures = {pool.submit(_parse_bytes_in_worker, data): digest for digest, (data, _) in pending.items()}
+        for future in as_completed(futures):
+            try:
+                resume_data, version, records = future.result()
+                metrics.replay(records)
+            except Exception as e:
+                print(f"Error parsing resume: {e}")
+                resume_data, version = {'error': f'An error occurred: {e}'}, None
+            yield from finish(futures[future], resume_data, version)
+    else:
+        for digest, (data, _) in pending.items():
+            yield from finish(digest, *_parse_bytes(data))
+
+
+def parse_many_cached(sources, cache=None):
+    """Parse a batch of resume bytes, returning results in input order"""
+    results = [None] * len(sources)
+    for index, resume_data in iter_parse_cached(sources, cache):
+        results[index] = resume_data
+    return results
@@ -1,53 +1,267 @@
+import io
+import os
 import re
-from pdfminer.high_level import extract_text
-from docx import Document
-
-# Common tech skills keywords (expanded list)
-SKILL_KEYWORDS = {
-    'python', 'java', 'javascript', 'c++', 'c#', 'ruby', 'php', 'swift', 'kotlin',
-    'go', 'rust', 'typescript', 'r', 'matlab', 'scala', 'perl',
-    'html', 'css', 'sql', 'nosql', 'mongodb', 'postgresql', 'mysql', 'oracle',
-    'react', 'angular', 'vue', 'node.js', 'express', 'django', 'flask', 'spring',
-    'machine learning', 'deep learning', 'ai', 'nlp', 'computer vision',
-    'tensorflow', 'pytorch', 'keras', 'scikit-learn', 'pandas', 'numpy',
-    'docker', 'kubernetes', 'jenkins', 'git', 'github', 'gitlab',
-    'aws', 'azure', 'gcp', 'cloud', 'devops', 'ci/cd',
-    'rest api', 'graphql', 'microservices', 'agile', 'scrum',
-    'linux', 'unix', 'bash', 'shell', 'powershell',
-    'tableau', 'power bi', 'excel', 'data visualization',
-    'spark', 'hadoop', 'kafka', 'redis', 'elasticsearch',
-    'figma', 'sketch', 'adobe xd', 'photoshop', 'illustrator',
-    'ux', 'ui', 'wireframing', 'prototyping', 'user research',
-    'terraform', 'ansible', 'puppet', 'chef',
-    'monitoring', 'prometheus', 'grafana', 'elk',
-    'security', 'networking', 'vpn', 'firewall',
-    'jira', 'confluence', 'slack', 'trello',
-    'testing', 'junit', 'pytest', 'selenium', 'jest',
-    'webpack', 'babel', 'npm', 'yarn',
-    'responsive design', 'bootstrap', 'tailwind', 'sass', 'less',
-    'redux', 'mobx', 'vuex', 'next.js', 'nuxt.js',
-    'mlops', 'model deployment', 'feature engineering',
-    'neural networks', 'cnn', 'rnn', 'lstm', 'transformer',
-    'statistics', 'probability', 'mathematics', 'algorithms',
-    'data structures', 'object-oriented programming', 'functional programming',
-    'api', 'json', 'xml', 'yaml', 'regex'
-}
-
-
-def extract_text_from_pdf(file_path):
-    """Extract text from PDF file"""
+import threading
+import time
+import zipfile
+from pdfminer.converter import TextConverter
+from pdfminer.layout import LAParams
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
+
+import metrics
+from job_catalog import get_catalog
+from skill_taxonomy import ALL_SKILLS, SKILL_VOCABULARY
+
+# Bounds on PDF extraction so huge or pathological files can't stall a worker
+PDF_MAX_PAGES = int(os.environ.get('PDF_MAX_PAGES', 50))
+PDF_TIME_BUDGET = float(os.environ.get('PDF_TIME_BUDGET', 10.0))
+MAX_TEXT_CHARS = int(os.environ.get('MAX_TEXT_CHARS', 200000))
+
+# Layout analysis tuned for speed: boxes_flow=None skips the expensive
+# text-box ordering pass, which plain keyword extraction doesn't need
+PDF_LAPARAMS = LAParams(boxes_flow=None, detect_vertical=False, all_texts=False)
+
+# Bump whenever parse_resume's output changes, so cached parses are redone
+PARSER_VERSION = 3
+
+# Skill keywords come from the shared taxonomy
+SKILL_KEYWORDS = ALL_SKILLS
+
+
+def _is_word_char(char):
+    return char.isalnum() or char == '_'
+
+
+def _trie_pattern(words):
+    """Build a regex alternation that shares common prefixes between words"""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # Greedy optional: try the longer keyword first, fall back to the shorter one
+        if '' in node:
+            return '(?:' + body + ')?'
+        return body
+
+    return build(trie)
+
+
+class SkillMatcher:
+    """Finds every skill keyword in a text with one pass of a combined regex
+
+    forms maps each spelling to look for (canonical names and aliases) to the
+    canonical skill it stands for; a plain iterable of skills matches them as-is.
+    """
+
+    def __init__(self, forms):
+        if not isinstance(forms, dict):
+            forms = {skill: skill for skill in forms}
+        self.forms = {form.lower(): skill.lower() for form, skill in forms.items()}
+        self.skills = frozenset(self.forms.values())
+
+        # Prefix-shared alternation, longest keyword first ('javascript' before 'java').
+        # Lookarounds instead of \b so keywords ending in symbols ('c++', 'c#') still match.
+        self.pattern = re.compile(
+            r'(?<!\w)(?:' + _trie_pattern(self.forms) + r')(?!\w)', re.IGNORECASE
+        )
+
+        # Record the shorter skills each keyword starts with ('rest' in 'rest api'),
+        # together with their lengths; skills starting later inside a match are
+        # found by resuming the scan at the next word inside it
+        self.nested = {}
+        for form in self.forms:
+            inner = self._prefix_skills(form)
+            if inner:
+                self.nested[form] = inner
+
+    def _prefix_skills(self, form):
+        ends = [j for j in range(1, len(form)) if not _is_word_char(form[j])]
+        return [
+            (self.forms[form[:j]], j) for j in ends
+            if form[:j] in self.forms and self.forms[form[:j]] != self.forms[form]
+        ]
+
+    def find(self, text):
+        """Return a dict mapping each canonical skill found to its list of (start, end) spans"""
+        matches = {}
+        search = self.pattern.search
+        match = search(text)
+        while match is not None:
+            start = match.start()
+            form = match.group().lower()
+            skill = self.forms.get(form)
+            if skill is not None:
+                found = {skill: match.end()}
+                for inner, length in self.nested.get(form, ()):
+                    found.setdefault(inner, start + length)
+                for found_skill, end in found.items():
+                    matches.setdefault(found_skill, []).append((start, end))
+            # Keywords can overlap ('big data' and 'data visualization'), so resume
+            # inside the match; the lookbehind only lets it restart at a word
+            match = search(text, start + 1)
+        return matches
+
+    def count(self, text):
+        """Return a dict mapping each skill found to its number of occurrences"""
+        return {skill: len(spans) for skill, spans in self.find(text).items()}
+
+
+_matcher = None
+_matcher_size = 0
+_matcher_lock = threading.Lock()
+
+
+def get_skill_matcher():
+    """Matcher for every skill and alias in the vocabulary, rebuilt when it grows
+
+    Loading the job catalog interns its required skills, so a catalog that
+    introduces new skills makes them extractable too.
+    """
+    global _matcher, _matcher_size
+    get_catalog()
+    if _matcher is None or _matcher_size != len(SKILL_VOCABULARY):
+        with _matcher_lock:
+            size = len(SKILL_VOCABULARY)
+            if _matcher is None or _matcher_size != size:
+                forms = SKILL_VOCABULARY.surface_forms()
+                # Matching runs on cleaned text, so also look for each spelling
+                # as clean_text leaves it ('ui/ux' -> 'ui ux')
+                for form, skill in list(forms.items()):
+                    forms.setdefault(clean_text(form), skill)
+                _matcher = SkillMatcher(forms)
+                _matcher_size = size
+    return _matcher
+
+
+def extraction_version():
+    """Parser version plus a digest of the skill vocabulary (which the job catalog extends)
+
+    Anything derived from a parse, like cached parse results or stored
+    scores, is only valid for the version it was made with.
+    """
+    get_skill_matcher()
+    return f'{PARSER_VERSION}:{SKILL_VOCABULARY.digest()}'
+
+
+def open_source(source):
+    """Return a seekable binary stream for a file path, bytes or file-like object"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    if isinstance(source, (str, os.PathLike)):
+        return open(source, 'rb')
+    if not source.seekable():
+        return io.BytesIO(source.read())
+    return source
+
+
+def detect_format(stream):
+    """Detect 'pdf' or 'docx' from a stream's magic bytes, or None"""
+    start = stream.tell()
+    header = stream.read(1024)
+    stream.seek(start)
+
+    # The PDF header may be preceded by junk, which readers tolerate
+    if b'%PDF-' in header:
+        return 'pdf'
+
+    if header.startswith(b'PK\x03\x04'):
+        try:
+            with zipfile.ZipFile(stream) as archive:
+                if 'word/document.xml' in archive.namelist():
+                    return 'docx'
+        except zipfile.BadZipFile:
+            pass
+        finally:
+            stream.seek(start)
+
+    return None
+
+
+class PDFBudgetExceeded(Exception):
+    pass
+
+
+class _BudgetedTextConverter(TextConverter):
+    """TextConverter that aborts once the extraction deadline has passed"""
+
+    def __init__(self, *args, deadline, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.deadline = deadline
+
+    def render_string(self, *args, **kwargs):
+        if time.monotonic() > self.deadline:
+            raise PDFBudgetExceeded()
+        return super().render_string(*args, **kwargs)
+
+    def paint_path(self, *args, **kwargs):
+        if time.monotonic() > self.deadline:
+            raise PDFBudgetExceeded()
+        return super().paint_path(*args, **kwargs)
+
+
+def iter_pdf_pages(source, max_pages=None, max_chars=None, time_budget=None):
+    """Yield a PDF's text one page at a time, stopping at the page, character or time limit"""
+    max_pages = PDF_MAX_PAGES if max_pages is None else max_pages
+    max_chars = MAX_TEXT_CHARS if max_chars is None else max_chars
+    time_budget = PDF_TIME_BUDGET if time_budget is None else time_budget
+
+    stream = open_source(source)
+    output = io.StringIO()
+    resource_manager = PDFResourceManager(caching=True)
+    deadline = time.monotonic() + time_budget
+    device = _BudgetedTextConverter(resource_manager, output, laparams=PDF_LAPARAMS, deadline=deadline)
+    interpreter = PDFPageInterpreter(resource_manager, device)
+    total_chars = 0
+
     try:
-        text = extract_text(file_path)
-        return text
+        for page_number, page in enumerate(PDFPage.get_pages(stream, maxpages=max_pages), start=1):
+            # The converter only checks while rendering; parsing a page happens before that
+            if time.monotonic() > deadline:
+                raise PDFBudgetExceeded()
+            interpreter.process_page(page)
+            text = output.getvalue()
+            output.seek(0)
+            output.truncate()
+
+            if max_chars and total_chars + len(text) >= max_chars:
+                yield text[:max_chars - total_chars]
+                return
+            total_chars += len(text)
+            yield text
+    except PDFBudgetExceeded:
+        print(f"PDF extraction stopped at page {page_number}: time budget of {time_budget}s exceeded")
     except Exception as e:
         print(f"Error extracting PDF: {e}")
-        return ""
+    finally:
+        device.close()
+        if stream is not source:
+            stream.close()
+
+
+def extract_text_from_pdf(source):
+    """Extract text from a PDF file path or binary stream"""
+    return "".join(iter_pdf_pages(source))
 
 
-def extract_text_from_docx(file_path):
-    """Extract text from DOCX file"""
+def load_docx():
+    """Import python-docx on first use; PDF-only processes never pay for it"""
+    from docx import Document
+    return Document
+
+
+def extract_text_from_docx(source):
+    """Extract text from a DOCX file path or binary stream"""
     try:
-        doc = Document(file_path)
+        doc = load_docx()(source)
         text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
         return text
     except Exception as e:
@@ -55,63 +269,139 @@ def extract_text_from_docx(file_path):
         return ""
 
 
+# Runs of anything other than word characters and . , - + # collapse to one space
+_NON_TEXT = re.compile(r'[^\w.,+#-]+')
+
+EMAIL_PATTERN = r'[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b'
+PHONE_PATTERN = r'(?:\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
+_EMAIL = re.compile(r'\b' + EMAIL_PATTERN)
+_PHONE = re.compile(PHONE_PATTERN)
+# Both in one alternation so a single scan finds the first of each
+_CONTACT = re.compile(r'\b(?P<email>' + EMAIL_PATTERN + r')|(?P<phone>' + PHONE_PATTERN + r')')
+
+
 def clean_text(text):
-    """Clean and normalize text"""
-    text = re.sub(r'\s+', ' ', text)
-    text = re.sub(r'[^\w\s\.\,\-\+\#]', ' ', text)
-    return text.strip()
+    """Clean and normalize text in a single substitution pass"""
+    return _NON_TEXT.sub(' ', text).strip()
+
+
+def find_skills(text):
+    """Find skills in text, returning each canonical skill's match spans"""
+    return get_skill_matcher().find(text)
 
 
 def extract_skills(text):
     """Extract skills from text using keyword matching"""
-    text_lower = text.lower()
-    found_skills = set()
-    
-    # Direct keyword matching
-    for skill in SKILL_KEYWORDS:
-        pattern = r'\b' + re.escape(skill) + r'\b'
-        if re.search(pattern, text_lower):
-            found_skills.add(skill)
-    
-    return list(found_skills)
+    return list(find_skills(text))
 
 
 def extract_email(text):
     """Extract email from resume"""
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    emails = re.findall(email_pattern, text)
-    return emails[0] if emails else None
+    match = _EMAIL.search(text)
+    return match.group() if match else None
 
 
 def extract_phone(text):
     """Extract phone number from resume"""
-    phone_pattern = r'(\+?\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-    phones = re.findall(phone_pattern, text)
-    return phones[0] if phones else None
-
-
-def parse_resume(file_path):
-    """Main function to parse resume and extract information"""
-    if file_path.lower().endswith('.pdf'):
-        raw_text = extract_text_from_pdf(file_path)
-    elif file_path.lower().endswith('.docx'):
-        raw_text = extract_text_from_docx(file_path)
-    else:
-        return {'error': 'Unsupported file format. Please upload PDF or DOCX.'}
+    match = _PHONE.search(text)
+    return match.group().strip() if match else None
+
+
+def find_contact(text, email=None, phone=None):
+    """First email and phone in raw text, stopping the scan as soon as both are known
+
+    Pass the values found on earlier pages; a page is not scanned at all
+    once both are filled in.
+    """
+    if email is not None and phone is not None:
+        return email, phone
+    for match in _CONTACT.finditer(text):
+        if match.lastgroup == 'email':
+            if email is None:
+                email = match.group()
+        elif phone is None:
+            phone = match.group().strip()
+        if email is not None and phone is not None:
+            break
+    return email, phone
+
+
+def parse_resume(source, include_raw_text=False):
+    """Main function to parse resume and extract information
+
+    source may be a file path, the file's bytes or a binary file-like object;
+    the format is detected from the content rather than the file name. The
+    extracted text is only kept as 'raw_text' when include_raw_text is set.
+    """
+    timer = metrics.stage_timer()
+    stream = open_source(source)
+    try:
+        if metrics.METRICS_ENABLED:
+            start = stream.tell()
+            metrics.observe('resume_file_bytes', stream.seek(0, io.SEEK_END) - start,
+                            buckets=metrics.BYTES_BUCKETS)
+            stream.seek(start)
+        
+        file_format = detect_format(stream)
+        if file_format == 'pdf':
+            # Pages are cleaned and scanned as they are extracted
+            pages = iter_pdf_pages(stream)
+        elif file_format == 'docx':
+            with timer('extraction'):
+                pages = iter([extract_text_from_docx(stream)])
+        else:
+            metrics.inc('resume_errors_total', stage='format')
+            return {'error': 'Unsupported file format. Please upload PDF or DOCX.'}
+        
+        raw_parts = []
+        page_count = 0
+        has_text = False
+        cleaned_parts = []
+        skills = {}
+        email = None
+        phone = None
+        while True:
+            with timer('extraction'):
+                page_text = next(pages, None)
+            if page_text is None:
+                break
+            page_count += 1
+            has_text = has_text or bool(page_text)
+            if include_raw_text:
+                raw_parts.append(page_text)
+            # Contact details are matched on the raw text, where '@' and
+            # phone punctuation are still intact
+            with timer('extract_contact'):
+                email, phone = find_contact(page_text, email, phone)
+            with timer('clean_text'):
+                cleaned_page = clean_text(page_text)
+            if not cleaned_page:
+                continue
+            cleaned_parts.append(cleaned_page)
+            with timer('extract_skills'):
+                skills.update(dict.fromkeys(find_skills(cleaned_page)))
+    finally:
+        if stream is not source:
+            stream.close()
+    
+    if file_format == 'pdf':
+        metrics.observe('resume_pdf_pages', page_count, buckets=metrics.PAGES_BUCKETS)
+    timer.finish()
     
-    if not raw_text:
+    if not has_text:
+        metrics.inc('resume_errors_total', stage='extraction')
         return {'error': 'Could not extract text from file.'}
     
-    cleaned_text = clean_text(raw_text)
-    skills = extract_skills(cleaned_text)
-    email = extract_email(cleaned_text)
-    phone = extract_phone(cleaned_text)
+    cleaned_text = " ".join(cleaned_parts)
+    skills = list(skills)
     
-    return {
-        'raw_text': raw_text,
+    resume_data = {
         'cleaned_text': cleaned_text,
         'skills': skills,
         'email': email,
         'phone': phone,
         'skill_count': len(skills)
-    }
\ No newline at end of file
+    }
+    if include_raw_text:
+        resume_data['raw_text'] = "".join(raw_parts)
+    return resume_data
\ No newline at end of file
@@ -0,0 +1,493 @@
+"""Persistent store of parsed resumes with an inverted skill index for reverse search.
+
+Ingest a folder from the command line:
+    python resume_store.py ingest resumes/ --workers 8
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy import sparse
+
+from resume_cache import content_digest, parse_resume_cached
+from resume_parser import extract_skills, extraction_version
+from similarity import SEMANTIC_WEIGHT, SKILL_WEIGHT
+from skill_taxonomy import SKILL_VOCABULARY
+from tfidf_model import get_model
+
+RESUME_STORE_DB = os.environ.get(
+    'RESUME_STORE_DB',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'resume_store.db')
+)
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS resumes (
+    id INTEGER PRIMARY KEY,
+    digest TEXT NOT NULL UNIQUE,
+    name TEXT,
+    email TEXT,
+    phone TEXT,
+    skills TEXT NOT NULL,
+    text BLOB NOT NULL,
+    vector_indices BLOB NOT NULL,
+    vector_data BLOB NOT NULL,
+    model_digest TEXT NOT NULL,
+    skills_version TEXT NOT NULL DEFAULT '',
+    created REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS scores (
+    resume_id INTEGER NOT NULL,
+    job_title TEXT NOT NULL,
+    job_hash TEXT NOT NULL,
+    vectorizer_digest TEXT NOT NULL,
+    overall_match REAL NOT NULL,
+    semantic_match REAL NOT NULL,
+    skill_match REAL NOT NULL,
+    matched_skills_count INTEGER NOT NULL,
+    skills_version TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (resume_id, job_title)
+)
+'''
+
+# Columns added after the first release, created on older databases when opened
+ADDED_COLUMNS = {
+    'resumes': {'skills_version': "TEXT NOT NULL DEFAULT ''"},
+    'scores': {'skills_version': "TEXT NOT NULL DEFAULT ''"}
+}
+
+
+def _add_missing_columns(db):
+    for table, columns in ADDED_COLUMNS.items():
+        existing = {row[1] for row in db.execute(f'PRAGMA table_info({table})')}
+        for column, definition in columns.items():
+            if column not in existing:
+                db.execute(f'ALTER TABLE {table} ADD COLUMN {column} {definition}')
+
+
+class ResumeStore:
+    """SQLite-backed resume store with in-memory skill postings and stacked TF-IDF vectors
+
+    Each skill maps to a sorted int32 array of row numbers, so a query only
+    touches the postings of the job's required skills. Candidates are then
+    reranked with the same weighted formula as analyze_resume_for_job.
+    """
+
+    def __init__(self, db_path=RESUME_STORE_DB):
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._db = None
+        self._db_pid = None
+        self._loaded = False
+
+    def _connection(self):
+        if self._db is None or self._db_pid != os.getpid():
+            self._db = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            self._db.executescript(SCHEMA)
+            _add_missing_columns(self._db)
+            self._db.commit()
+            self._db_pid = os.getpid()
+        return self._db
+
+    def _reset_index(self):
+        self.ids = []
+        self.digests = {}
+        self.skill_masks = []
+        self.contacts = []
+        self.postings = {}
+        self._vector_rows = []
+        self._matrix = None
+        self._model_digest = None
+        self._skills_version = None
+        self._last_id = 0
+
+    def _ensure_loaded(self):
+        """Bring the in-memory index up to date with the database
+
+        The first call, a new TF-IDF fit or a change in the skill vocabulary
+        rebuilds the index from scratch; later calls only load rows added
+        since, including those written by other processes.
+        """
+        model = get_model()
+        skills_version = extraction_version()
+        if (not self._loaded or self._model_digest != model.vectorizer_digest
+                or self._skills_version != skills_version):
+            self._reset_index()
+            self._model_digest = model.vectorizer_digest
+            self._skills_version = skills_version
+            self._loaded = True
+
+        db = self._connection()
+        stale = []
+        stale_skills = []
+        rows = db.execute(
+            'SELECT id, digest, name, email, phone, skills, vector_indices, vector_data, model_digest, '
+            'skills_version, text FROM resumes WHERE id > ? ORDER BY id', (self._last_id,)
+        ).fetchall()
+        for row in rows:
+            resume_id, digest, name, email, phone, skills, indices, data, model_digest, row_version, text = row
+            if model_digest == model.vectorizer_digest:
+                vector = _vector_from_blobs(indices, data, model.job_matrix.shape[1])
+            else:
+                # Vectorized by an older TF-IDF fit; re-vectorize from the stored text
+                vector = model.transform([zlib.decompress(text).decode('utf-8')])
+                stale.append((resume_id, vector))
+            if row_version == skills_version:
+                skills = json.loads(skills)
+            else:
+                # Extracted with another skill vocabulary; the catalog may have added skills since
+                skills = sorted(extract_skills(zlib.decompress(text).decode('utf-8')))
+                stale_skills.append((json.dumps(skills), skills_version, resume_id))
+            self._index_row(resume_id, digest, name, email, phone, skills, vector)
+            self._last_id = resume_id
+
+        if stale:
+            db.executemany(
+                'UPDATE resumes SET vector_indices = ?, vector_data = ?, model_digest = ? WHERE id = ?',
+                [(*_vector_to_blobs(vector), model.vectorizer_digest, resume_id) for resume_id, vector in stale]
+            )
+        if stale_skills:
+            db.executemany('UPDATE resumes SET skills = ?, skills_version = ? WHERE id = ?', stale_skills)
+        if stale or stale_skills:
+            db.commit()
+
+    def _index_row(self, resume_id, digest, name, email, phone, skills, vector):
+        row = len(self.ids)
+        self.ids.append(resume_id)
+        self.digests[digest] = row
+        skill_ids = {skill_id for skill_id in map(SKILL_VOCABULARY.lookup, skills) if skill_id is not None}
+        self.skill_masks.append(SKILL_VOCABULARY.mask(skills))
+        self.contacts.append((name, email, phone))
+        for skill_id in skill_ids:
+            self.postings.setdefault(skill_id, array('i')).append(row)
+        self._vector_rows.append(vector)
+        self._matrix = None
+
+    def _vectors(self):
+        if self._matrix is None:
+            width = get_model().job_matrix.shape[1]
+            if self._vector_rows:
+                self._matrix = sparse.vstack(self._vector_rows, format='csr')
+                self._vector_rows = [self._matrix]
+            else:
+                self._matrix = sparse.csr_matrix((0, width))
+        return self._matrix
+
+    def add_many(self, items):
+        """Store parsed resumes given as (digest, name, resume_data); returns their ids"""
+        with self._lock:
+            self._ensure_loaded()
+            model = get_model()
+            db = self._connection()
+
+            new = [
+                (digest, name, resume_data) for digest, name, resume_data in items
+                if digest not in self.digests
+            ]
+            vectors = model.transform([resume_data['cleaned_text'] for _, _, resume_data in new]) if new else None
+
+            now = time.time()
+            for position, (digest, name, resume_data) in enumerate(new):
+                db.execute(
+                    'INSERT OR IGNORE INTO resumes (digest, name, email, phone, skills, text, vector_indices, '
+                    'vector_data, model_digest, skills_version, created) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    (
+                        digest, name, resume_data.get('email'), resume_data.get('phone'),
+                        json.dumps(sorted(resume_data['skills'])),
+                        zlib.compress(resume_data['cleaned_text'].encode('utf-8')),
+                        *_vector_to_blobs(vectors[position]), model.vectorizer_digest,
+                        self._skills_version, now
+                    )
+                )
+            db.commit()
+
+            # Index the new rows, and any another process added meanwhile, in id order
+            self._ensure_loaded()
+
+            return [
+                self.ids[self.digests[digest]] if digest in self.digests else None
+                for digest, _, _ in items
+            ]
+
+    def add(self, digest, name, resume_data):
+        """Store one parsed resume and return its id"""
+        return self.add_many([(digest, name, resume_data)])[0]
+
+    def __len__(self):
+        with self._lock:
+            self._ensure_loaded()
+            return len(self.ids)
+
+    def search(self, job_title, top_k=20, min_skills=1, must_have=()):
+        """Rank stored resumes for a catalog job without scanning every document"""
+        with self._lock:
+            self._ensure_loaded()
+            model = get_model()
+            catalog = model.catalog
+            if job_title not in catalog:
+                return None
+
+            required = catalog.skill_ids[job_title]
+            row_count = len(self.ids)
+            if not required or not row_count:
+                return []
+
+            # Union of the postings, counting how many required skills each resume has
+            postings = [np.frombuffer(self.postings[skill_id], dtype=np.int32)
+                        for skill_id in required if skill_id in self.postings]
+            if not postings:
+                return []
+            counts = np.bincount(np.concatenate(postings), minlength=row_count)
+            candidates = np.flatnonzero(counts >= max(1, min_skills))
+
+            # Intersection with the must-have skills
+            for skill in must_have:
+                skill_postings = self.postings.get(SKILL_VOCABULARY.lookup(skill))
+                if skill_postings is None:
+                    return []
+                candidates = np.intersect1d(
+                    candidates, np.frombuffer(skill_postings, dtype=np.int32), assume_unique=True
+                )
+            if not len(candidates):
+                return []
+
+            job_vector = model.job_matrix[model.job_index[job_title]]
+            semantic = np.round(
+                (self._vectors()[candidates] @ job_vector.T).toarray().ravel() * 100, 2
+            )
+            skill = np.round(counts[candidates] * 100 / len(required), 2)
+            overall = np.round(semantic * SEMANTIC_WEIGHT + skill * SKILL_WEIGHT, 2)
+
+            order = np.lexsort((candidates, -overall))[:max(0, int(top_k))]
+            required_mask = catalog.skill_masks[job_title]
+            results = []
+            for i in order:
+                row = candidates[i]
+                name, email, phone = self.contacts[row]
+                results.append({
+                    'resume_id': self.ids[row],
+                    'name': name,
+                    'email': email,
+                    'phone': phone,
+                    'overall_match': float(overall[i]),
+                    'semantic_match': float(semantic[i]),
+                    'skill_match': float(skill[i]),
+                    'matched_skills': sorted(SKILL_VOCABULARY.names_from_mask(required_mask & self.skill_masks[row])),
+                    'matched_skills_count': int(counts[row]),
+                    'total_required_skills': len(required)
+                })
+            return results
+
+    def rescore(self):
+        """Bring the stored scores up to date with the catalog, recomputing only what changed
+
+        A (resume, job) pair is recomputed when it has no score yet, when the
+        job's description or required skills changed, when the TF-IDF
+        vector space was refit, or when the skill vocabulary changed (the
+        stored skills are then re-extracted); every other pair is skipped.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            model = get_model()
+            catalog = model.catalog
+            db = self._connection()
+            row_count = len(self.ids)
+
+            stored = {}
+            for job_title, job_hash, vectorizer_digest, skills_version, resume_id in db.execute(
+                'SELECT job_title, job_hash, vectorizer_digest, skills_version, resume_id FROM scores'
+            ):
+                stored.setdefault((job_title, job_hash, vectorizer_digest, skills_version), set()).add(resume_id)
+
+            removed = db.execute(
+                'DELETE FROM scores WHERE job_title NOT IN (%s)' % ','.join('?' * len(catalog.titles)),
+                catalog.titles
+            ).rowcount if catalog.titles else db.execute('DELETE FROM scores').rowcount
+
+            recomputed = skipped = 0
+            changed_jobs = []
+            row_ids = np.array(self.ids, dtype=np.int64)
+            for job_title in catalog.titles:
+                current = stored.get(
+                    (job_title, catalog.job_hashes[job_title], model.vectorizer_digest, self._skills_version), set()
+                )
+                rows = np.array(
+                    [row for row, resume_id in enumerate(self.ids) if resume_id not in current],
+                    dtype=np.int64
+                )
+                skipped += row_count - len(rows)
+                if not len(rows):
+                    continue
+                changed_jobs.append(job_title)
+
+                required = catalog.skill_ids[job_title]
+                postings = [np.frombuffer(self.postings[skill_id], dtype=np.int32)
+                            for skill_id in required if skill_id in self.postings]
+                counts = (np.bincount(np.concatenate(postings), minlength=row_count)
+                          if postings else np.zeros(row_count, dtype=np.int64))[rows]
+
+                job_vector = model.job_matrix[model.job_index[job_title]]
+                semantic = np.round((self._vectors()[rows] @ job_vector.T).toarray().ravel() * 100, 2)
+                skill = (np.round(counts * 100 / len(required), 2) if required
+                         else np.zeros(len(rows)))
+                overall = np.round(semantic * SEMANTIC_WEIGHT + skill * SKILL_WEIGHT, 2)
+
+                db.executemany(
+                    'INSERT OR REPLACE INTO scores (resume_id, job_title, job_hash, vectorizer_digest, '
+                    'overall_match, semantic_match, skill_match, matched_skills_count, skills_version) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    zip(
+                        row_ids[rows].tolist(), [job_title] * len(rows),
+                        [catalog.job_hashes[job_title]] * len(rows), [model.vectorizer_digest] * len(rows),
+                        overall.tolist(), semantic.tolist(), skill.tolist(), counts.tolist(),
+                        [self._skills_version] * len(rows)
+                    )
+                )
+                recomputed += len(rows)
+            db.commit()
+
+            return {
+                'recomputed': recomputed,
+                'skipped': skipped,
+                'removed': removed,
+                'changed_jobs': changed_jobs,
+                'vectorizer_digest': model.vectorizer_digest,
+                'skills_version': self._skills_version
+            }
+
+    def scores(self, job_title, top_k=20):
+        """Best stored scores for a job, as written by rescore(); scores gone stale since are left out"""
+        with self._lock:
+            self._ensure_loaded()
+            model = get_model()
+            catalog = model.catalog
+            if job_title not in catalog:
+                return None
+            rows = self._connection().execute(
+                'SELECT s.resume_id, r.name, s.overall_match, s.semantic_match, s.skill_match, '
+                's.matched_skills_count FROM scores s JOIN resumes r ON r.id = s.resume_id '
+                'WHERE s.job_title = ? AND s.job_hash = ? AND s.vectorizer_digest = ? AND s.skills_version = ? '
+                'ORDER BY s.overall_match DESC, s.resume_id LIMIT ?',
+                (job_title, catalog.job_hashes[job_title], model.vectorizer_digest, self._skills_version,
+                 max(0, int(top_k)))
+            ).fetchall()
+        return [
+            {
+                'resume_id': resume_id,
+                'name': name,
+                'overall_match': overall,
+                'semantic_match': semantic,
+                'skill_match': skill,
+                'matched_skills_count': matched
+            }
+            for resume_id, name, overall, semantic, skill, matched in rows
+        ]
+
+
+def _vector_to_blobs(vector):
+    vector = vector.tocsr()
+    return (
+        vector.indices.astype(np.int32).tobytes(),
+        vector.data.astype(np.float32).tobytes()
+    )
+
+
+def _vector_from_blobs(indices, data, width):
+    indices = np.frombuffer(indices, dtype=np.int32)
+    data = np.frombuffer(data, dtype=np.float32).astype(np.float64)
+    return sparse.csr_matrix((data, indices, [0, len(indices)]), shape=(1, width))
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Process-wide resume store, opened lazily"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ResumeStore()
+        return _store
+
+
+def _parse_path(path):
+    with open(path, 'rb') as f:
+        data = f.read()
+    return path, content_digest(data), parse_resume_cached(data)
+
+
+def ingest(paths, workers, chunk_size=500):
+    """Parse files on a process pool and store them in bulk transactions"""
+    store = get_store()
+    added = failed = 0
+    chunk = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for path, digest, resume_data in executor.map(_parse_path, paths, chunksize=16):
+            if 'error' in resume_data:
+                failed += 1
+                continue
+            chunk.append((digest, os.path.basename(path), resume_data))
+            if len(chunk) >= chunk_size:
+                store.add_many(chunk)
+                added += len(chunk)
+                chunk = []
+    if chunk:
+        store.add_many(chunk)
+        added += len(chunk)
+    return added, failed
+
+
+def main(argv=None):
+    from batch_analyze import find_resumes
+
+    parser = argparse.ArgumentParser(description='Manage the resume store.')
+    subcommands = parser.add_subparsers(dest='command', required=True)
+    ingest_parser = subcommands.add_parser('ingest', help='Parse and store a directory or manifest of resumes')
+    ingest_parser.add_argument('source')
+    ingest_parser.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 1)
+    search_parser = subcommands.add_parser('search', help='Find the stored resumes that best fit a job')
+    search_parser.add_argument('job_title')
+    search_parser.add_argument('--top-k', type=int, default=20)
+    subcommands.add_parser('rescore', help='Update stored scores for the jobs that changed')
+    scores_parser = subcommands.add_parser('scores', help='Best scores written by rescore for a job')
+    scores_parser.add_argument('job_title')
+    scores_parser.add_argument('--top-k', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    if args.command == 'ingest':
+        start = time.perf_counter()
+        added, failed = ingest(find_resumes(args.source), max(1, args.workers))
+        print(f"Stored {added} resumes ({failed} failed to parse) in {time.perf_counter() - start:.1f}s",
+              file=sys.stderr)
+    elif args.command == 'rescore':
+        start = time.perf_counter()
+        report = get_store().rescore()
+        print(f"Recomputed {report['recomputed']} pairs, skipped {report['skipped']}, "
+              f"removed {report['removed']} in {time.perf_counter() - start:.1f}s "
+              f"({len(report['changed_jobs'])} jobs changed)", file=sys.stderr)
+        print(json.dumps(report))
+    elif args.command == 'scores':
+        results = get_store().scores(args.job_title, args.top_k)
+        if results is None:
+            parser.error(f'unknown job title: {args.job_title}')
+        for result in results:
+            print(json.dumps(result))
+    else:
+        results = get_store().search(args.job_title, args.top_k)
+        if results is None:
+            parser.error(f'unknown job title: {args.job_title}')
+        for result in results:
+            print(json.dumps(result))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
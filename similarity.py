@@ -0,0 +1,176 @@
+"""Interchangeable semantic-similarity engines scored against the job catalog.
+
+Every engine turns texts into sparse query rows and keeps one row per
+catalog job, so scoring any number of resumes is a single sparse product.
+Scores are fractions in [0, 1].
+"""
+import os
+import threading
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer, HashingVectorizer
+
+from job_catalog import get_catalog
+from tfidf_model import VECTORIZER_PARAMS, get_model
+
+SIMILARITY_ENGINE = os.environ.get('SIMILARITY_ENGINE', 'tfidf').lower()
+
+# Weights of the semantic and skill scores in the overall match
+SEMANTIC_WEIGHT = float(os.environ.get('SEMANTIC_WEIGHT', 0.4))
+SKILL_WEIGHT = float(os.environ.get('SKILL_WEIGHT', 0.6))
+
+# BM25 term-frequency saturation and length normalization
+BM25_K1 = float(os.environ.get('BM25_K1', 1.2))
+BM25_B = float(os.environ.get('BM25_B', 0.75))
+
+# Hashed feature space; fixed size, so memory doesn't grow with the vocabulary
+HASHING_FEATURES = int(os.environ.get('HASHING_FEATURES', 2 ** 18))
+
+
+class SimilarityEngine:
+    """Scores texts against every job of one catalog snapshot"""
+
+    name = None
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self.job_index = {title: i for i, title in enumerate(catalog.titles)}
+        self.job_matrix = None
+        # Changes whenever a job's score could change without its own description changing
+        self.version = self.name
+
+    def transform(self, texts):
+        """Sparse query rows for a list of texts"""
+        raise NotImplementedError
+
+    def scores(self, texts):
+        """Similarity of each text against every job: array of shape (texts, jobs)"""
+        return (self.transform(texts) @ self.job_matrix.T).toarray()
+
+    def similarities(self, text):
+        """Similarity (as a fraction) between one text and every catalog job"""
+        return self.scores([text])[0]
+
+    def similarity(self, text, job_title):
+        """Similarity (as a percentage) between one text and one catalog job"""
+        index = self.job_index.get(job_title)
+        if index is None:
+            return 0.0
+        score = (self.transform([text]) @ self.job_matrix[index].T).sum()
+        return round(float(score) * 100, 2)
+
+
+class TfidfEngine(SimilarityEngine):
+    """Cosine similarity in the catalog-fitted TF-IDF space"""
+
+    name = 'tfidf'
+
+    def __init__(self, model):
+        super().__init__(model.catalog)
+        self.model = model
+        self.vectorizer = model.vectorizer
+        self.job_matrix = model.job_matrix
+        self.version = f'tfidf:{model.vectorizer_digest}'
+
+    def transform(self, texts):
+        return self.model.transform(texts)
+
+
+class Bm25Engine(SimilarityEngine):
+    """Okapi BM25 with the catalog jobs as documents and the resume as the query
+
+    Each job row holds the BM25 weight of its terms divided by the job's
+    total, so a resume containing every term of a job scores 1.0.
+    """
+
+    name = 'bm25'
+
+    def __init__(self, catalog):
+        super().__init__(catalog)
+        self.vectorizer = CountVectorizer(stop_words=VECTORIZER_PARAMS['stop_words'])
+        descriptions = [catalog.jobs[title]['description'] for title in catalog.titles]
+        try:
+            counts = self.vectorizer.fit_transform(descriptions).tocsr().astype(np.float64)
+        except ValueError:
+            # No catalog, or only stop words
+            self.vectorizer = CountVectorizer(vocabulary=['\x00'])
+            counts = sparse.csr_matrix((len(descriptions), 1))
+
+        documents = counts.shape[0]
+        document_frequency = np.bincount(counts.indices, minlength=counts.shape[1])
+        idf = np.log1p((documents - document_frequency + 0.5) / (document_frequency + 0.5))
+
+        lengths = np.asarray(counts.sum(axis=1)).ravel()
+        average_length = lengths.mean() if documents else 0.0
+        norms = BM25_K1 * (1 - BM25_B + BM25_B * lengths / average_length) if average_length else \
+            np.full(documents, BM25_K1)
+
+        weights = counts.copy()
+        rows = np.repeat(np.arange(documents), np.diff(counts.indptr))
+        tf = weights.data
+        weights.data = idf[weights.indices] * tf * (BM25_K1 + 1) / (tf + norms[rows])
+
+        totals = np.asarray(weights.sum(axis=1)).ravel()
+        totals[totals == 0] = 1.0
+        self.job_matrix = sparse.diags(1 / totals) @ weights
+        # IDF and average length span the whole catalog
+        self.version = f'bm25:{BM25_K1}:{BM25_B}:{catalog.digest}'
+
+    def transform(self, texts):
+        query = self.vectorizer.transform(texts)
+        query.data[:] = 1.0
+        return query
+
+
+class HashingEngine(SimilarityEngine):
+    """Cosine similarity of hashed term counts; needs no fitted vocabulary"""
+
+    name = 'hashing'
+
+    def __init__(self, catalog):
+        super().__init__(catalog)
+        self.vectorizer = HashingVectorizer(
+            n_features=HASHING_FEATURES, stop_words=VECTORIZER_PARAMS['stop_words'],
+            alternate_sign=False, norm='l2'
+        )
+        self.version = f'hashing:{HASHING_FEATURES}'
+        self.job_matrix = self.transform(
+            [catalog.jobs[title]['description'] for title in catalog.titles]
+        ).tocsr()
+
+    def transform(self, texts):
+        return self.vectorizer.transform(texts)
+
+
+ENGINES = {
+    'tfidf': TfidfEngine,
+    'bm25': Bm25Engine,
+    'hashing': HashingEngine,
+}
+
+_engines = {}
+_lock = threading.Lock()
+
+
+def get_engine(name=None):
+    """Engine for the current catalog, by name or SIMILARITY_ENGINE; rebuilt when the catalog changes"""
+    if isinstance(name, SimilarityEngine):
+        return name
+    name = (name or SIMILARITY_ENGINE).lower()
+    if name not in ENGINES:
+        raise ValueError(f'Unknown similarity engine "{name}". Choose from: {", ".join(ENGINES)}')
+
+    # TF-IDF follows the fitted model, the others the catalog itself
+    source = get_model() if name == 'tfidf' else get_catalog()
+    engine = _engines.get(name)
+    if engine is not None and engine.source is source:
+        return engine
+
+    with _lock:
+        engine = _engines.get(name)
+        if engine is None or engine.source is not source:
+            engine = ENGINES[name](source)
+            engine.source = source
+            _engines[name] = engine
+        return engine
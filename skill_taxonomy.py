@@ -0,0 +1,224 @@
+import hashlib
+import json
+import threading
+
+# Single source of truth for the skills the parser recognises and how they are categorized
+
+SKILL_CATEGORIES = {
+    'Programming Languages': (
+        'python', 'java', 'javascript', 'c++', 'c#', 'ruby', 'php',
+        'swift', 'kotlin', 'go', 'rust', 'typescript', 'r', 'scala'
+    ),
+    'Web Development': (
+        'html', 'css', 'react', 'angular', 'vue', 'node.js', 'express',
+        'django', 'flask', 'spring', 'bootstrap', 'tailwind', 'sass',
+        'webpack', 'next.js', 'responsive design'
+    ),
+    'Databases': (
+        'sql', 'nosql', 'mongodb', 'postgresql', 'mysql', 'oracle',
+        'redis', 'elasticsearch'
+    ),
+    'Machine Learning & AI': (
+        'machine learning', 'deep learning', 'ai', 'nlp', 'computer vision',
+        'tensorflow', 'pytorch', 'keras', 'scikit-learn', 'neural networks',
+        'cnn', 'rnn', 'lstm', 'transformer'
+    ),
+    'Data Science': (
+        'pandas', 'numpy', 'statistics', 'data visualization', 'tableau',
+        'power bi', 'spark', 'hadoop', 'big data'
+    ),
+    'DevOps & Cloud': (
+        'docker', 'kubernetes', 'jenkins', 'aws', 'azure', 'gcp',
+        'terraform', 'ansible', 'ci/cd', 'linux', 'bash'
+    ),
+    'Design': (
+        'figma', 'sketch', 'adobe xd', 'photoshop', 'illustrator',
+        'ux', 'ui', 'wireframing', 'prototyping'
+    ),
+    'Tools & Others': (
+        'git', 'github', 'jira', 'agile', 'scrum', 'rest api',
+        'graphql', 'testing', 'selenium'
+    ),
+}
+
+# Recognised skills that are not shown under any category
+UNCATEGORIZED_SKILLS = (
+    'matlab', 'perl', 'gitlab', 'cloud', 'devops', 'microservices',
+    'unix', 'shell', 'powershell', 'excel', 'kafka',
+    'user research', 'puppet', 'chef',
+    'monitoring', 'prometheus', 'grafana', 'elk',
+    'security', 'networking', 'vpn', 'firewall',
+    'confluence', 'slack', 'trello',
+    'junit', 'pytest', 'jest',
+    'babel', 'npm', 'yarn', 'less',
+    'redux', 'mobx', 'vuex', 'nuxt.js',
+    'mlops', 'model deployment', 'feature engineering',
+    'probability', 'mathematics', 'algorithms',
+    'data structures', 'object-oriented programming', 'functional programming',
+    'api', 'json', 'xml', 'yaml', 'regex'
+)
+
+CATEGORY_NAMES = tuple(SKILL_CATEGORIES)
+
+# skill -> index into CATEGORY_NAMES
+SKILL_CATEGORY = {
+    skill: index
+    for index, skills in enumerate(SKILL_CATEGORIES.values())
+    for skill in skills
+}
+
+ALL_SKILLS = frozenset(SKILL_CATEGORY).union(UNCATEGORIZED_SKILLS)
+
+# Alternative spellings and abbreviations -> canonical skill
+SKILL_ALIASES = {
+    'js': 'javascript',
+    'ecmascript': 'javascript',
+    'golang': 'go',
+    'cpp': 'c++',
+    'c sharp': 'c#',
+    'python3': 'python',
+    'postgres': 'postgresql',
+    'postgre sql': 'postgresql',
+    'psql': 'postgresql',
+    'mongo': 'mongodb',
+    'ms sql': 'sql',
+    'elastic search': 'elasticsearch',
+    'reactjs': 'react',
+    'react.js': 'react',
+    'angularjs': 'angular',
+    'vuejs': 'vue',
+    'vue.js': 'vue',
+    'nodejs': 'node.js',
+    'expressjs': 'express',
+    'express.js': 'express',
+    'nextjs': 'next.js',
+    'nuxtjs': 'nuxt.js',
+    'tailwindcss': 'tailwind',
+    'tailwind css': 'tailwind',
+    'html5': 'html',
+    'css3': 'css',
+    'sklearn': 'scikit-learn',
+    'scikit learn': 'scikit-learn',
+    'ml': 'machine learning',
+    'artificial intelligence': 'ai',
+    'natural language processing': 'nlp',
+    'neural network': 'neural networks',
+    'transformers': 'transformer',
+    'k8s': 'kubernetes',
+    'amazon web services': 'aws',
+    'google cloud': 'gcp',
+    'google cloud platform': 'gcp',
+    'microsoft azure': 'azure',
+    'ci cd': 'ci/cd',
+    'cicd': 'ci/cd',
+    'continuous integration': 'ci/cd',
+    'powerbi': 'power bi',
+    'ms excel': 'excel',
+    'microsoft excel': 'excel',
+    'restful api': 'rest api',
+    'rest apis': 'rest api',
+    'restful apis': 'rest api',
+    'apis': 'api',
+    'oop': 'object-oriented programming',
+    'object oriented programming': 'object-oriented programming',
+    'user experience': 'ux',
+    'user interface': 'ui',
+    'firewalls': 'firewall',
+    'unit testing': 'testing',
+}
+
+
+def normalize_skill(name):
+    """Lowercase, trim and collapse internal whitespace"""
+    return ' '.join(name.lower().split())
+
+
+class SkillVocabulary:
+    """Interned skill names: each canonical skill gets a small, stable integer id
+
+    Aliases resolve to the id of their canonical skill, so skill sets can be
+    handled as int sets or bitmasks instead of lists of strings.
+    """
+
+    def __init__(self, skills=(), aliases=None):
+        self.names = []
+        self._ids = {}
+        # Reentrant: add_alias interns its canonical skill while holding it
+        self._lock = threading.RLock()
+        self._digest = None
+        for skill in sorted(skills):
+            self.intern(skill)
+        self.aliases = {}
+        for alias, canonical in (aliases or {}).items():
+            self.add_alias(alias, canonical)
+
+    def __len__(self):
+        return len(self.names)
+
+    def intern(self, name):
+        """Return the id for a skill, adding it as a new canonical skill if unseen"""
+        key = normalize_skill(name)
+        skill_id = self._ids.get(key)
+        if skill_id is None:
+            with self._lock:
+                skill_id = self._ids.get(key)
+                if skill_id is None:
+                    skill_id = len(self.names)
+                    self.names.append(key)
+                    self._ids[key] = skill_id
+                    self._digest = None
+        return skill_id
+
+    def add_alias(self, alias, canonical):
+        alias = normalize_skill(alias)
+        with self._lock:
+            self.aliases[alias] = normalize_skill(canonical)
+            self._ids[alias] = self.intern(canonical)
+            self._digest = None
+
+    def digest(self):
+        """Short hash of every surface form and its skill; changes whenever extraction could"""
+        with self._lock:
+            if self._digest is None:
+                forms = sorted(self.surface_forms().items())
+                self._digest = hashlib.sha256(json.dumps(forms).encode('utf-8')).hexdigest()[:16]
+            return self._digest
+
+    def lookup(self, name):
+        """Id for a skill or alias, or None if unknown"""
+        return self._ids.get(normalize_skill(name))
+
+    def canonical(self, name):
+        """Canonical spelling of a skill; unknown skills are returned normalized"""
+        skill_id = self.lookup(name)
+        return self.names[skill_id] if skill_id is not None else normalize_skill(name)
+
+    def surface_forms(self):
+        """Every canonical name and alias, mapped to its canonical name"""
+        with self._lock:
+            return {form: self.names[skill_id] for form, skill_id in self._ids.items()}
+
+    def ids(self, names):
+        """Ids for a list of skills, interning unknown ones"""
+        return [self.intern(name) for name in names]
+
+    def mask(self, names):
+        """Bitmask with one bit set per skill; unknown skills are skipped"""
+        mask = 0
+        for name in names:
+            skill_id = self.lookup(name)
+            if skill_id is not None:
+                mask |= 1 << skill_id
+        return mask
+
+    def names_from_mask(self, mask):
+        """Canonical names for the bits set in a mask, in id order"""
+        names = []
+        while mask:
+            lowest = mask & -mask
+            names.append(self.names[lowest.bit_length() - 1])
+            mask ^= lowest
+        return names
+
+
+SKILL_VOCABULARY = SkillVocabulary(ALL_SKILLS, SKILL_ALIASES)
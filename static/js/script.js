@@ -6,12 +6,19 @@ document.addEventListener('DOMContentLoaded', function() {
     const analyzeBtn = document.getElementById('analyzeBtn');
     const btnText = analyzeBtn.querySelector('.btn-text');
     const btnLoader = analyzeBtn.querySelector('.btn-loader');
+    const batchResults = document.getElementById('batchResults');
+    const batchStatus = document.getElementById('batchStatus');
+    const batchList = document.getElementById('batchList');
 
     // Handle file selection
     fileInput.addEventListener('change', function(e) {
-        const file = e.target.files[0];
-        if (file) {
-            fileNameSpan.textContent = file.name;
+        const files = e.target.files;
+        if (files.length > 1) {
+            fileNameSpan.textContent = `${files.length} files selected`;
+            fileNameSpan.style.display = 'block';
+            hideError();
+        } else if (files.length === 1) {
+            fileNameSpan.textContent = files[0].name;
             fileNameSpan.style.display = 'block';
             hideError();
         } else {
@@ -26,7 +33,8 @@ document.addEventListener('DOMContentLoaded', function() {
         
         hideError();
         
-        const file = fileInput.files[0];
+        const files = Array.from(fileInput.files);
+        const file = files[0];
         const jobTitle = document.getElementById('job_title').value;
 
         // Validate inputs
@@ -40,6 +48,12 @@ document.addEventListener('DOMContentLoaded', function() {
             return;
         }
 
+        if (files.length > 1) {
+            // Several files are validated per file by the server
+            await analyzeBatch(files, jobTitle);
+            return;
+        }
+
         // Check file size (16MB max)
         if (file.size > 16 * 1024 * 1024) {
             showError('File size must be less than 16MB');
@@ -57,35 +71,173 @@ document.addEventListener('DOMContentLoaded', function() {
         const formData = new FormData();
         formData.append('resume', file);
         formData.append('job_title', jobTitle);
+        // Background jobs can only be polled when a single process serves the site
+        const useAsync = uploadForm.dataset.asyncUploads === '1';
+        if (useAsync) {
+            formData.append('async', '1');
+        }
 
         // Show loading state
         setLoadingState(true);
 
         try {
-            const response = await fetch('/upload', {
+            let response = await fetch('/upload', {
                 method: 'POST',
                 body: formData
             });
 
-            const data = await response.json();
+            let data = await response.json();
 
-            if (response.ok) {
-                // Store results in sessionStorage
-                sessionStorage.setItem('analysisResults', JSON.stringify(data));
-                
-                // Redirect to results page
-                window.location.href = '/results';
+            if (response.status === 202) {
+                // Analysis runs in the background; poll until it finishes
+                let result = await pollResult(data.result_url);
+                if (result === null) {
+                    // Another process answered the poll; analyze synchronously instead
+                    formData.delete('async');
+                    response = await fetch('/upload', {
+                        method: 'POST',
+                        body: formData
+                    });
+                    data = await response.json();
+                    if (!response.ok) {
+                        throw new Error(data.error || 'An error occurred during analysis');
+                    }
+                    result = data;
+                }
+                showResults(result);
+            } else if (response.ok) {
+                showResults(data);
             } else {
                 showError(data.error || 'An error occurred during analysis');
                 setLoadingState(false);
             }
         } catch (error) {
             console.error('Error:', error);
-            showError('Failed to connect to server. Please try again.');
+            showError(error.message || 'Failed to connect to server. Please try again.');
             setLoadingState(false);
         }
     });
 
+    async function analyzeBatch(files, jobTitle) {
+        const formData = new FormData();
+        files.forEach(file => formData.append('resume', file));
+        formData.append('job_title', jobTitle);
+
+        // One placeholder row per file, filled in as results stream back
+        batchList.innerHTML = '';
+        const rows = files.map(file => {
+            const row = document.createElement('li');
+            row.className = 'batch-item pending';
+            row.innerHTML = '<span class="batch-name"></span><span class="batch-score">Analyzing...</span>';
+            row.querySelector('.batch-name').textContent = file.name;
+            batchList.appendChild(row);
+            return row;
+        });
+        batchStatus.textContent = `Analyzing ${files.length} resumes...`;
+        batchResults.style.display = 'block';
+        setLoadingState(true);
+
+        try {
+            const response = await fetch('/upload', {
+                method: 'POST',
+                body: formData
+            });
+
+            if (!response.ok) {
+                const data = await response.json();
+                throw new Error(data.error || 'An error occurred during analysis');
+            }
+
+            // The response is NDJSON: one line per file, in completion order
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+            let finished = 0;
+
+            while (true) {
+                const { value, done } = await reader.read();
+                if (done) break;
+                buffer += decoder.decode(value, { stream: true });
+
+                let newline;
+                while ((newline = buffer.indexOf('\n')) >= 0) {
+                    const line = buffer.slice(0, newline).trim();
+                    buffer = buffer.slice(newline + 1);
+                    if (!line) continue;
+
+                    const record = JSON.parse(line);
+                    if (record.done) {
+                        batchStatus.textContent = `Analyzed ${record.total} resumes` +
+                            (record.errors ? ` (${record.errors} failed)` : '');
+                        continue;
+                    }
+                    renderBatchRow(rows[record.index], record);
+                    finished += 1;
+                    batchStatus.textContent = `Analyzed ${finished} of ${files.length} resumes...`;
+                }
+            }
+        } catch (error) {
+            console.error('Error:', error);
+            showError(error.message || 'Failed to connect to server. Please try again.');
+        } finally {
+            setLoadingState(false);
+        }
+    }
+
+    function renderBatchRow(row, record) {
+        const score = row.querySelector('.batch-score');
+
+        if (record.error) {
+            row.className = 'batch-item failed';
+            score.textContent = record.error;
+            return;
+        }
+
+        const result = record.result;
+        row.className = 'batch-item';
+        score.textContent = `${result.overall_match}% match · ` +
+            `${result.matched_skills_count}/${result.total_required_skills} skills`;
+
+        const button = document.createElement('button');
+        button.type = 'button';
+        button.className = 'btn-secondary';
+        button.textContent = 'View details';
+        button.addEventListener('click', () => showResults(result));
+        row.appendChild(button);
+    }
+
+    // Resolves to the finished result, or null if the job isn't known here
+    async function pollResult(resultUrl) {
+        let delay = 300;
+
+        while (true) {
+            await new Promise(resolve => setTimeout(resolve, delay));
+            delay = Math.min(delay * 1.5, 2000);
+
+            const response = await fetch(resultUrl);
+            if (response.status === 404) {
+                // The job lives in a process this request didn't reach
+                return null;
+            }
+            const data = await response.json();
+
+            if (data.status === 'done') {
+                return data.result;
+            }
+            if (!response.ok || data.status === 'error') {
+                throw new Error(data.error || 'An error occurred during analysis');
+            }
+        }
+    }
+
+    function showResults(data) {
+        // Store results in sessionStorage
+        sessionStorage.setItem('analysisResults', JSON.stringify(data));
+
+        // Redirect to results page
+        window.location.href = '/results';
+    }
+
     function showError(message) {
         errorMessage.textContent = message;
         errorMessage.style.display = 'block';
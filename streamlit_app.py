@@ -1,7 +1,7 @@
 import streamlit as st
-import os
-from resume_parser import parse_resume
-from job_matcher import analyze_resume_for_job, load_job_descriptions
+from resume_cache import parse_resume_cached
+from job_matcher import analyze_resume_for_job
+from job_catalog import get_catalog
 
 st.set_page_config(page_title="Resume Analyzer", page_icon="🧾", layout="wide")
 
@@ -60,7 +60,7 @@ with col1:
     uploaded_file = st.file_uploader("Upload Resume", type=['pdf', 'docx'])
 
 with col2:
-    job_titles = list(load_job_descriptions().keys())
+    job_titles = list(get_catalog().titles)
     selected_job = st.selectbox("Select Job Title", options=job_titles)
 
 if st.button("🔍 Analyze Resume", type="primary", use_container_width=True):
@@ -70,16 +70,8 @@ if st.button("🔍 Analyze Resume", type="primary", use_container_width=True):
         st.error("⚠️ Please select a job title")
     else:
         with st.spinner("🔄 Analyzing your resume..."):
-            # Save uploaded file temporarily
-            temp_path = f"temp_{uploaded_file.name}"
-            with open(temp_path, "wb") as f:
-                f.write(uploaded_file.getbuffer())
-            
-            # Parse resume
-            resume_data = parse_resume(temp_path)
-            
-            # Clean up temp file
-            os.remove(temp_path)
+            # Parse resume straight from the uploaded bytes
+            resume_data = parse_resume_cached(uploaded_file.getvalue())
             
             if 'error' in resume_data:
                 st.error(f"❌ {resume_data['error']}")
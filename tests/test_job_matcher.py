@@ -0,0 +1,28 @@
+from job_matcher import calculate_skill_match, identify_missing_skills
+from skill_taxonomy import SKILL_VOCABULARY
+
+
+def test_unknown_required_skills_count_against_the_match():
+    assert calculate_skill_match(['python'], ['python', 'Foo Framework', 'Bar']) == (33.33, ['python'])
+
+
+def test_unknown_required_skills_are_reported_missing():
+    assert identify_missing_skills(['python'], ['python', 'Foo Framework']) == ['foo framework']
+
+
+def test_only_unknown_required_skills_still_returns_a_tuple():
+    assert calculate_skill_match(['python'], ['Foo Framework', 'Bar']) == (0.0, [])
+    assert calculate_skill_match(['python'], []) == (0.0, [])
+
+
+def test_aliases_match_their_canonical_skill():
+    assert calculate_skill_match(['postgres'], ['PostgreSQL']) == (100.0, ['postgresql'])
+    assert identify_missing_skills(['postgres'], ['postgresql', 'sql']) == ['sql']
+
+
+def test_scoring_does_not_intern_caller_skills():
+    size = len(SKILL_VOCABULARY)
+    calculate_skill_match(['Baz Toolkit'], ['Foo Framework'])
+    identify_missing_skills(['Baz Toolkit'], ['Foo Framework'])
+    assert len(SKILL_VOCABULARY) == size
+    assert SKILL_VOCABULARY.lookup('foo framework') is None
@@ -0,0 +1,45 @@
+import http.server
+import subprocess
+import sys
+import threading
+
+from benchmarks.load_test import HealthPoller, MemorySampler
+
+
+class _OkHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    def log_message(self, *args):
+        pass
+
+
+def test_memory_sampler_starts_and_stops():
+    process = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'])
+    try:
+        sampler = MemorySampler(process, 'flask', 0.01)
+        sampler.start()
+        sampler.stop()
+        assert not sampler.is_alive()
+        assert sampler.samples
+    finally:
+        process.kill()
+        process.wait()
+
+
+def test_health_poller_starts_and_stops():
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _OkHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        poller = HealthPoller(f'http://127.0.0.1:{server.server_port}/', 0.01)
+        poller.start()
+        report = poller.stop()
+        assert not poller.is_alive()
+        assert report['checks'] >= 1
+        assert report['error_rate'] == 0
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,56 @@
+import io
+
+from docx import Document
+from flask import Response
+
+import metrics
+import resume_cache
+from resume_cache import ResumeCache, parse_many_cached
+
+
+def _stage_count(stage):
+    series = metrics.registry._histograms.get('resume_stage_seconds', {}).get('series', {})
+    return series.get((('stage', stage),), {}).get('count', 0)
+
+
+def _docx(text):
+    document = Document()
+    document.add_paragraph(text)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def test_recorded_metrics_are_applied_on_replay(monkeypatch):
+    monkeypatch.setattr(metrics, 'METRICS_ENABLED', True)
+    before = _stage_count('test_stage')
+    with metrics.recording() as records:
+        timer = metrics.stage_timer()
+        with timer('test_stage'):
+            pass
+        timer.finish()
+    assert _stage_count('test_stage') == before
+    metrics.replay(records)
+    assert _stage_count('test_stage') == before + 1
+
+
+def test_pool_parses_record_their_stages_in_the_parent(monkeypatch):
+    monkeypatch.setattr(metrics, 'METRICS_ENABLED', True)
+    monkeypatch.setattr(resume_cache, 'PARSE_WORKERS', 2)
+    before = _stage_count('extraction')
+    results = parse_many_cached([_docx('python and sql'), _docx('java and aws')], ResumeCache(max_entries=0))
+    assert all('error' not in resume_data for resume_data in results)
+    assert _stage_count('extraction') == before + 2
+
+
+def test_streamed_responses_get_no_server_timing(monkeypatch):
+    monkeypatch.setattr(metrics, 'TIMING_HEADERS', True)
+    metrics.start_request()
+    metrics._request.timings['parse'] = 0.01
+    response = metrics.finish_request('upload', Response(iter(['{}\n']), mimetype='application/x-ndjson'))
+    assert 'Server-Timing' not in response.headers
+
+    metrics.start_request()
+    metrics._request.timings['parse'] = 0.01
+    response = metrics.finish_request('upload', Response('{}'))
+    assert response.headers['Server-Timing'] == 'parse;dur=10.00'
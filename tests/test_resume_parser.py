@@ -0,0 +1,78 @@
+import io
+import random
+import re
+
+import pytest
+
+import resume_parser
+from benchmarks.corpus import make_pdf
+from resume_parser import get_skill_matcher
+
+
+@pytest.fixture(scope='module')
+def matcher():
+    return get_skill_matcher()
+
+
+@pytest.fixture(scope='module')
+def reference(matcher):
+    """The per-keyword loop SkillMatcher replaces: one search per spelling"""
+    patterns = [
+        (re.compile(r'(?<!\w)' + re.escape(form) + r'(?!\w)', re.IGNORECASE), skill)
+        for form, skill in matcher.forms.items()
+    ]
+    return lambda text: {skill for pattern, skill in patterns if pattern.search(text)}
+
+
+def _overlapping_texts(forms):
+    # Every pair of spellings where one ends with words the other starts with,
+    # e.g. 'big data' + 'data visualization' -> 'big data visualization'
+    words = {form: form.split() for form in forms}
+    for first, first_words in words.items():
+        for second, second_words in words.items():
+            for size in range(1, min(len(first_words), len(second_words))):
+                if first_words[-size:] == second_words[:size]:
+                    yield ' '.join(first_words + second_words[size:])
+
+
+def test_find_matches_the_per_keyword_reference(matcher, reference):
+    forms = sorted(matcher.forms)
+    texts = list(forms) + list(_overlapping_texts(forms))
+
+    # Random runs of vocabulary words, so spellings meet in arbitrary ways
+    rng = random.Random(1234)
+    words = sorted({word for form in forms for word in form.split()})
+    texts += [' '.join(rng.choices(words, k=40)) for _ in range(300)]
+
+    for text in texts:
+        found = matcher.find(text)
+        assert set(found) == reference(text), text
+        for skill, spans in found.items():
+            assert all(matcher.forms.get(text[start:end].lower()) == skill for start, end in spans), text
+
+
+@pytest.mark.parametrize('text, skills', [
+    ('big data visualization', {'big data', 'data visualization'}),
+    ('responsive design systems', {'responsive design', 'design systems'}),
+    ('rest api', {'rest api', 'api'}),
+])
+def test_find_credits_overlapping_skills(matcher, text, skills):
+    assert skills <= set(matcher.find(text))
+
+
+def test_pdf_extraction_stops_once_the_budget_has_expired(monkeypatch, capsys):
+    processed = []
+    process_page = resume_parser.PDFPageInterpreter.process_page
+    monkeypatch.setattr(resume_parser.PDFPageInterpreter, 'process_page',
+                        lambda self, page: processed.append(page) or process_page(self, page))
+    pdf = make_pdf([f'Line {i} python sql' for i in range(200)], lines_per_page=20)
+
+    assert len(list(resume_parser.iter_pdf_pages(io.BytesIO(pdf), time_budget=60))) == 10
+    assert len(processed) == 10
+
+    # Pages that render nothing never reach the converter's checks, so an
+    # expired budget must stop the loop before the first page is processed
+    processed.clear()
+    assert list(resume_parser.iter_pdf_pages(io.BytesIO(pdf), time_budget=-1)) == []
+    assert processed == []
+    assert 'time budget' in capsys.readouterr().out
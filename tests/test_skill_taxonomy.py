@@ -0,0 +1,44 @@
+import threading
+
+from skill_taxonomy import SkillVocabulary
+
+
+def test_digest_and_surface_forms_are_safe_during_interning():
+    vocabulary = SkillVocabulary(['python'], {'py': 'python'})
+    errors = []
+    done = threading.Event()
+
+    def read():
+        try:
+            while not done.is_set():
+                vocabulary.surface_forms()
+                vocabulary.digest()
+        except Exception as e:
+            errors.append(e)
+
+    readers = [threading.Thread(target=read) for _ in range(2)]
+    for reader in readers:
+        reader.start()
+    for i in range(20000):
+        vocabulary.intern(f'skill {i}')
+        if i % 1000 == 0:
+            vocabulary.add_alias(f'alias {i}', f'skill {i}')
+    done.set()
+    for reader in readers:
+        reader.join()
+
+    assert not errors
+    # The cached digest matches the final vocabulary, not one seen mid-reload
+    expected = SkillVocabulary()
+    expected._ids, expected.names = dict(vocabulary._ids), list(vocabulary.names)
+    assert vocabulary.digest() == expected.digest()
+
+
+def test_digest_changes_with_the_vocabulary():
+    vocabulary = SkillVocabulary(['python'])
+    before = vocabulary.digest()
+    vocabulary.intern('zigbee')
+    assert vocabulary.digest() != before
+    after = vocabulary.digest()
+    vocabulary.add_alias('zb', 'zigbee')
+    assert vocabulary.digest() != after
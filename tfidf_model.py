@@ -0,0 +1,175 @@
+import hashlib
+import os
+import threading
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from job_catalog import get_catalog
+
+TFIDF_MODEL_PATH = os.environ.get(
+    'TFIDF_MODEL_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'tfidf_model.npz')
+)
+
+VECTORIZER_PARAMS = {'max_features': 1000, 'stop_words': 'english'}
+
+# When the catalog changes, refit the IDF only if at least this fraction of
+# the vocabulary would change; otherwise keep the existing vector space so
+# stored resume vectors and scores stay valid
+TFIDF_REFIT_THRESHOLD = float(os.environ.get('TFIDF_REFIT_THRESHOLD', 0.10))
+
+
+class TfidfModel:
+    """TF-IDF vectorizer fitted over the job catalog, with the job vectors kept as a sparse matrix"""
+
+    def __init__(self, vectorizer, catalog):
+        self.vectorizer = vectorizer
+        self.catalog = catalog
+        self.catalog_digest = catalog.digest
+        self.titles = catalog.titles
+        self.job_index = {title: i for i, title in enumerate(self.titles)}
+        # Identifies the vector space; resume vectors are comparable while it is unchanged
+        self.vectorizer_digest = _vectorizer_digest(vectorizer)
+        if self.titles:
+            self.job_matrix = vectorizer.transform(
+                [catalog.jobs[title]['description'] for title in self.titles]
+            ).tocsr()
+        else:
+            self.job_matrix = sparse.csr_matrix((0, len(vectorizer.idf_)))
+
+    @classmethod
+    def fit(cls, catalog):
+        """Fit a new vectorizer on every job description in the catalog"""
+        vectorizer = TfidfVectorizer(**VECTORIZER_PARAMS)
+        descriptions = [catalog.jobs[title]['description'] for title in catalog.titles]
+        if descriptions:
+            try:
+                vectorizer.fit(descriptions)
+            except ValueError:
+                # Every description was empty or stop words only
+                vectorizer = _empty_vectorizer()
+        else:
+            vectorizer = _empty_vectorizer()
+        return cls(vectorizer, catalog)
+
+    @classmethod
+    def load(cls, path, catalog, require_match=True):
+        """Load a saved model, or return None if it was fitted on a different catalog
+
+        With require_match=False the saved vectorizer is applied to the given
+        catalog whichever catalog it was fitted on.
+        """
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if require_match and str(data['catalog_digest']) != catalog.digest:
+                    return None
+                terms = data['vocabulary']
+                idf = data['idf']
+        except (OSError, KeyError, ValueError):
+            return None
+
+        vectorizer = _vectorizer_from_arrays(terms, idf)
+        return cls(vectorizer, catalog)
+
+    def save(self, path):
+        """Persist the vocabulary and IDF weights so other workers start warm"""
+        vocabulary = self.vectorizer.vocabulary_
+        terms = np.empty(len(vocabulary), dtype=object)
+        for term, index in vocabulary.items():
+            terms[index] = term
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(
+                f,
+                vocabulary=terms.astype(str),
+                idf=self.vectorizer.idf_,
+                catalog_digest=np.array(self.catalog_digest)
+            )
+        os.replace(tmp_path, path)
+
+    def transform(self, texts):
+        """Vectorize a list of texts into L2-normalized TF-IDF rows"""
+        return self.vectorizer.transform(texts)
+
+    def similarity(self, resume_text, job_title):
+        """Cosine similarity (as a percentage) between a resume and one catalog job"""
+        index = self.job_index.get(job_title)
+        if index is None:
+            return 0.0
+        resume_vector = self.transform([resume_text])
+        similarity = resume_vector.multiply(self.job_matrix[index]).sum()
+        return round(float(similarity) * 100, 2)
+
+    def similarities(self, resume_text):
+        """Cosine similarity (as a fraction) between a resume and every catalog job"""
+        resume_vector = self.transform([resume_text])
+        return (self.job_matrix @ resume_vector.T).toarray().ravel()
+
+
+def _vectorizer_from_arrays(terms, idf):
+    vectorizer = TfidfVectorizer(
+        stop_words=VECTORIZER_PARAMS['stop_words'],
+        vocabulary={str(term): i for i, term in enumerate(terms)}
+    )
+    vectorizer.idf_ = np.asarray(idf, dtype=np.float64)
+    return vectorizer
+
+
+def _vectorizer_digest(vectorizer):
+    terms = sorted(vectorizer.vocabulary_, key=vectorizer.vocabulary_.get)
+    digest = hashlib.sha256('\n'.join(terms).encode('utf-8'))
+    digest.update(np.asarray(vectorizer.idf_, dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+def vocabulary_shift(old_vectorizer, new_vectorizer):
+    """Fraction of terms added or removed between two vocabularies (Jaccard distance)"""
+    old_terms = set(old_vectorizer.vocabulary_)
+    new_terms = set(new_vectorizer.vocabulary_)
+    union = old_terms | new_terms
+    if not union:
+        return 0.0
+    return 1.0 - len(old_terms & new_terms) / len(union)
+
+
+def _empty_vectorizer():
+    # A vocabulary must be non-empty; a single unused token keeps transform() working
+    return _vectorizer_from_arrays(np.array(['\x00']), np.ones(1))
+
+
+_model = None
+_lock = threading.Lock()
+
+
+def get_model():
+    """Return the TF-IDF model for the current catalog, rebuilding it when the catalog changes"""
+    global _model
+
+    catalog = get_catalog()
+    model = _model
+    if model is not None and model.catalog_digest == catalog.digest:
+        return model
+
+    with _lock:
+        if _model is not None and _model.catalog_digest == catalog.digest:
+            return _model
+
+        model = TfidfModel.load(TFIDF_MODEL_PATH, catalog)
+        if model is None:
+            previous = _model or TfidfModel.load(TFIDF_MODEL_PATH, catalog, require_match=False)
+            model = TfidfModel.fit(catalog)
+            if previous is not None:
+                shift = vocabulary_shift(previous.vectorizer, model.vectorizer)
+                if shift < TFIDF_REFIT_THRESHOLD:
+                    # Small edit: re-project the jobs into the existing vector space
+                    model = TfidfModel(previous.vectorizer, catalog)
+                else:
+                    print(f"Refitting TF-IDF model: vocabulary shift {shift:.1%}")
+            try:
+                model.save(TFIDF_MODEL_PATH)
+            except OSError as e:
+                print(f"Could not save TF-IDF model: {e}")
+        _model = model
+        return model